@@ -1,12 +1,27 @@
 from mcp.server.fastmcp import FastMCP, Context
 import socket
+import struct
 import json
 import asyncio
 import logging
-from dataclasses import dataclass
+import re
+import itertools
+import functools
+import inspect
 from contextlib import asynccontextmanager
-from typing import AsyncIterator, Dict, Any, List
+from typing import AsyncIterator, Dict, Any, Iterator, List, Optional, Tuple
 import time
+import math
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; fall back to the stdlib codec
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # Optional compact framing, used when the extension supports it
+    msgpack = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, 
@@ -15,365 +30,786 @@ logger = logging.getLogger("SketchupMCPServer")
 
 # Define version directly to avoid pkg_resources dependency
 __version__ = "0.1.17"
-logger.info(f"SketchupMCP Server version {__version__} starting up")
+logger.info("SketchupMCP Server version %s starting up", __version__)
+
+# Largest response frame the stream reader will buffer
+MAX_RESPONSE_SIZE = 64 * 1024 * 1024
+# Kernel buffer size, large enough for the extension to write a response in one go
+SOCKET_BUFFER_SIZE = 262144
+# Fail writes to a dead peer after 15 seconds instead of waiting for operation timeouts
+TCP_USER_TIMEOUT_MS = 15000
+# Seconds allowed for the TCP handshake and for flushing a request
+CONNECT_TIMEOUT = 10.0
+WRITE_TIMEOUT = 30.0
+# Resends after a dropped connection, waiting RETRY_BACKOFF_STEP seconds
+# longer before each one up to RETRY_BACKOFF_MAX
+MAX_RETRIES = 3
+RETRY_BACKOFF_STEP = 0.5
+RETRY_BACKOFF_MAX = 2.0
+# A connection that delivered a response this recently (in seconds) is
+# trusted without probing the socket again
+CONNECTION_CHECK_TTL = 0.25
+# Seconds to wait for the extension to answer the framing negotiation;
+# older extensions answer with an error or not at all and get JSON
+HELLO_TIMEOUT = 2.0
+
+def _tune_socket(sock: socket.socket):
+    """Apply latency and buffer tuning; platform-specific options are optional"""
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_SIZE)
+    # Let the kernel notice a vanished peer on an idle persistent connection
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    # TCP_QUICKACK is left alone: Linux drops back to delayed ACKs after
+    # the next few segments, so setting it once here has no lasting effect
+    if hasattr(socket, "TCP_USER_TIMEOUT"):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_USER_TIMEOUT, TCP_USER_TIMEOUT_MS)
+
+# Wire codec for messages exchanged with the Sketchup extension
+if orjson is not None:
+    _encode_message = orjson.dumps
+    _decode_message = orjson.loads
+else:
+    _message_encoder = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False)
+
+    def _encode_message(obj: Any) -> bytes:
+        return _message_encoder.encode(obj).encode('utf-8')
+
+    _decode_message = json.loads
+
+# Negotiated per connection: msgpack frames are a 4-byte big-endian length
+# followed by the payload
+_MSGPACK_CONTENT_TYPE = "application/msgpack"
+_FRAME_HEADER = struct.Struct(">I")
+
+# Serializer for tool results handed back to the MCP client
+if orjson is not None:
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+else:
+    _dumps = json.dumps
+
+# The extension serializes every message with the envelope keys in a fixed
+# order: "jsonrpc" and "method" lead notifications, "id" closes responses.
+_MESSAGE_METHOD_RE = re.compile(rb'\{\s*"jsonrpc"\s*:\s*"2\.0"\s*,\s*"method"\s*:\s*"([^"\\]*)"')
+_MESSAGE_ID_RE = re.compile(rb',\s*"id"\s*:\s*(null|-?\d+|"(?:[^"\\]|\\.)*")\s*\}\s*$')
+_ID_TAIL_LENGTH = 256
+_UNKNOWN_ID = object()
+
+def _peek_id_method(frame: bytes) -> Tuple[Any, Optional[str]]:
+    """Extract the envelope "id" and "method" of a message without parsing it
+
+    Returns _UNKNOWN_ID when the id cannot be located cheaply, in which case
+    the caller should fall back to a full parse.
+    """
+    method_match = _MESSAGE_METHOD_RE.match(frame)
+    method = method_match.group(1).decode('utf-8') if method_match else None
+    id_match = _MESSAGE_ID_RE.search(frame, max(0, len(frame) - _ID_TAIL_LENGTH))
+    message_id = _decode_message(id_match.group(1)) if id_match else _UNKNOWN_ID
+    return message_id, method
+
+# Plain results are written as {"jsonrpc":"2.0","result":...,"id":...}
+_RESULT_PREFIX_RE = re.compile(rb'\{\s*"jsonrpc"\s*:\s*"2\.0"\s*,\s*"result"\s*:')
+
+def _raw_result(frame: bytes) -> Optional[bytes]:
+    """Slice the encoded "result" value out of a response frame
+
+    Returns None unless the frame is a plain result envelope, in which case
+    the caller should parse it instead.
+    """
+    prefix_match = _RESULT_PREFIX_RE.match(frame)
+    if not prefix_match:
+        return None
+    id_match = _MESSAGE_ID_RE.search(frame, max(prefix_match.end(), len(frame) - _ID_TAIL_LENGTH))
+    if not id_match:
+        return None
+    return frame[prefix_match.end():id_match.start()].strip()
+
+# How long to wait for a tool's response, in seconds
+_TOOL_TIMEOUTS: Dict[str, float] = {
+    # 1 minute for component creation; the create_component tools send the
+    # verifying variant, batch_call can send either
+    "create_component_with_verification": 60.0,
+    "create_component": 60.0,
+    # 3 minutes for complex operations
+    "boolean_operation": 180.0,
+    "create_dovetail": 180.0,
+    "create_mortise_tenon": 180.0,
+    "create_finger_joint": 180.0,
+    "eval_ruby": 300.0,  # 5 minutes for Ruby evaluation
+}
+_DEFAULT_TIMEOUT = 120.0  # Default 2 minutes
+
+# Encoded start of the tools/call envelope for each tool name seen so far
+_CALL_PREFIXES: Dict[str, bytes] = {}
+
+class _Call:
+    """The JSON-RPC tools/call request for one tool invocation
+
+    It is encoded before any connection is touched, so a request that
+    cannot be serialized fails on its own.
+    """
+    __slots__ = ("name", "arguments", "encoded", "packed")
+
+    def __init__(self, name: str, arguments: Dict[str, Any]):
+        self.name = name
+        self.arguments = arguments
+        # Cached encodings of everything but the id, kept across attempts
+        # since only the id changes: the JSON envelope prefix and arguments,
+        # and the msgpack map up to the id value
+        self.encoded: Optional[Tuple[bytes, bytes]] = None
+        self.packed: Optional[bytes] = None
+
+    def encode(self, use_msgpack: bool = False):
+        """Serialize the request for the given framing if not done yet, raising if it cannot be"""
+        if use_msgpack:
+            if self.packed is None:
+                # The id comes last, so dropping its nil leaves the map open for it
+                message = {"jsonrpc": "2.0", "method": "tools/call", "params": {"name": self.name, "arguments": self.arguments}, "id": None}
+                self.packed = msgpack.packb(message, use_bin_type=True)[:-1]
+        elif self.encoded is None:
+            prefix = _CALL_PREFIXES.get(self.name)
+            if prefix is None:
+                prefix = _CALL_PREFIXES[self.name] = b'{"jsonrpc":"2.0","method":"tools/call","params":{"name":' + _encode_message(self.name) + b',"arguments":'
+            self.encoded = (prefix, _encode_message(self.arguments))
+
+    def frame(self, wire_id: int, end: bytes = b'}') -> bytes:
+        """JSON encoding of the request, followed by end
+
+        Only the arguments are serialized per call; the envelope around them
+        is spliced in from bytes cached per tool name, with the id last as
+        the extension writes it. Pass end=b'}\n' for a complete line, so the
+        frame is joined in one copy.
+        """
+        self.encode()
+        prefix, arguments = self.encoded
+        return b''.join((prefix, arguments, b'},"id":', str(wire_id).encode(), end))
+
+    def pack(self, wire_id: int) -> bytes:
+        """msgpack encoding of the request, tagged with the id assigned per attempt"""
+        self.encode(use_msgpack=True)
+        return self.packed + msgpack.packb(wire_id)
+
+class SketchupError(Exception):
+    """Raised when Sketchup reports a failure for a single request"""
+
+class _PendingRequest:
+    """A request sent to Sketchup that is waiting for its response"""
+    __slots__ = ("wire_id", "writer", "future", "operation_id", "raw")
+
+    def __init__(self, wire_id: int, writer: asyncio.StreamWriter, future: asyncio.Future, raw: bool = False):
+        self.wire_id = wire_id
+        self.writer = writer
+        self.future = future
+        self.operation_id = None
+        # Resolve with the encoded result instead of the parsed one
+        self.raw = raw
+
+    def resolve(self, result: Any):
+        if not self.future.done():
+            self.future.set_result(result)
+
+    def fail(self, exc: BaseException):
+        if not self.future.done():
+            self.future.set_exception(exc)
 
-@dataclass
 class SketchupConnection:
-    host: str
-    port: int
-    sock: socket.socket = None
+    __slots__ = ("host", "port", "reader", "writer", "_lock", "_pending", "_request_ids", "_reader_task", "_last_ok_ts", "_msgpack", "_offer_msgpack")
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        # Held while connecting and writing a request so concurrent tool calls
+        # cannot interleave their frames on the shared stream
+        self._lock = asyncio.Lock()
+        # Requests awaiting a response, keyed by the id sent on the wire
+        self._pending: Dict[int, _PendingRequest] = {}
+        self._request_ids: Iterator[int] = itertools.count(1)
+        self._reader_task: Optional[asyncio.Task] = None
+        # time.monotonic() of the last frame received from Sketchup
+        self._last_ok_ts = 0.0
+        # Whether the current stream switched to msgpack framing, and whether
+        # new streams ask for it (not after a negotiation went unanswered)
+        self._msgpack = False
+        self._offer_msgpack = msgpack is not None
+
+    def __repr__(self) -> str:
+        return f"SketchupConnection(host={self.host!r}, port={self.port!r})"
+
+    def recently_ok(self) -> bool:
+        """Whether the connection delivered a response within CONNECTION_CHECK_TTL"""
+        return self._reader_task is not None and time.monotonic() - self._last_ok_ts < CONNECTION_CHECK_TTL
     
-    def connect(self) -> bool:
+    async def connect(self) -> bool:
         """Connect to the Sketchup extension socket server"""
-        logger.info(f"=== CONNECT START: Attempting to connect to {self.host}:{self.port} ===")
+        if self.recently_ok():
+            return True
         
-        if self.sock:
-            logger.info("Existing socket found, testing connection...")
+        logger.debug("=== CONNECT START: Attempting to connect to %s:%s ===", self.host, self.port)
+        
+        if self.writer:
+            logger.debug("Existing stream found, testing connection...")
             try:
-                # Test if connection is still alive
-                logger.info("Setting timeout for existing socket test...")
-                self.sock.settimeout(0.1)
-                logger.info("Sending test byte...")
-                self.sock.send(b'')
-                logger.info("Existing connection test passed")
-                return True
-            except (socket.error, BrokenPipeError, ConnectionResetError) as e:
-                # Connection is dead, close it and reconnect
-                logger.info(f"Connection test failed ({str(e)}), reconnecting...")
-                self.disconnect()
+                # A closed transport, EOF from the peer or a pending socket
+                # error all mean the connection is dead
+                if self._reader_task and not self.writer.is_closing() and not self.reader.at_eof():
+                    sock = self.writer.get_extra_info("socket")
+                    err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                    if err == 0:
+                        logger.debug("Existing connection test passed")
+                        return True
+                    logger.info("Connection test failed (socket error %s), reconnecting...", err)
+                else:
+                    logger.info("Connection closed by peer, reconnecting...")
+            except OSError as e:
+                logger.info("Connection test failed (%s), reconnecting...", e)
+            # Connection is dead, close it and reconnect
+            self.disconnect()
             
         try:
-            logger.info("Creating new socket...")
-            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            logger.info("Socket created successfully")
-            
-            # Set socket options to prevent hanging
-            logger.info("Setting socket options...")
-            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            logger.info("SO_REUSEADDR set")
-            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
-            logger.info("TCP_NODELAY set")
-            self.sock.settimeout(10.0)  # 10 second timeout
-            logger.info("Socket timeout set to 10.0 seconds")
-            
-            logger.info(f"About to call connect() to {self.host}:{self.port}...")
-            self.sock.connect((self.host, self.port))
-            logger.info(f"connect() call completed - TCP connection established!")
-            
-            # Set a longer timeout for actual operations
-            logger.info("Setting longer timeout for operations...")
-            self.sock.settimeout(30.0)
-            logger.info("Operational timeout set to 30.0 seconds")
+            await self._open_stream()
+            self._msgpack = False
+            if self._offer_msgpack:
+                accepted = await self._negotiate_framing()
+                if accepted is None:
+                    # The extension may still answer later and switch this
+                    # stream to msgpack, so start over on one that never
+                    # offered it
+                    logger.info("No framing negotiation reply from Sketchup, reconnecting with JSON")
+                    self._offer_msgpack = False
+                    self.writer.close()
+                    self.reader = self.writer = None
+                    await self._open_stream()
+                else:
+                    self._msgpack = accepted
+            self._reader_task = asyncio.create_task(self._read_responses())
             
             logger.info("=== CONNECT SUCCESS: Connection established successfully ===")
             return True
         except Exception as e:
-            logger.error(f"=== CONNECT FAILED: {str(e)} ===")
-            self.sock = None
+            logger.error("=== CONNECT FAILED: %s ===", e)
+            if self.writer is not None:
+                # The stream owns the socket once it has been opened
+                self.writer.close()
+            self.reader = self.writer = None
             return False
     
-    def disconnect(self):
-        """Disconnect from the Sketchup extension"""
-        if self.sock:
+    async def _open_stream(self):
+        """Open a tuned TCP stream to the extension"""
+        logger.debug("Creating new socket...")
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            sock.setblocking(False)
+            logger.debug("Socket created successfully")
+            
+            # Buffer sizes have to be set before connecting to affect the TCP window
+            logger.debug("Setting socket options...")
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            logger.debug("TCP_NODELAY set")
+            _tune_socket(sock)
+            logger.debug("Socket buffers and TCP timeouts tuned")
+            
+            logger.debug("About to call connect() to %s:%s...", self.host, self.port)
+            loop = asyncio.get_running_loop()
+            await asyncio.wait_for(loop.sock_connect(sock, (self.host, self.port)), timeout=CONNECT_TIMEOUT)
+            logger.debug("connect() call completed - TCP connection established!")
+            
+            self.reader, self.writer = await asyncio.open_connection(sock=sock, limit=MAX_RESPONSE_SIZE)
+        except BaseException:
+            sock.close()
+            raise
+    
+    async def _negotiate_framing(self) -> Optional[bool]:
+        """Ask the extension to switch the new stream to msgpack framing
+
+        Runs before the reader task starts, so the reply is read here.
+        Extensions without msgpack support answer with an error and the
+        stream stays on JSON lines. Returns None if no reply arrived within
+        HELLO_TIMEOUT, leaving the stream's framing undecided.
+        """
+        hello_id = next(self._request_ids)
+        hello = {"jsonrpc": "2.0", "method": "hello", "params": {"content_types": [_MSGPACK_CONTENT_TYPE]}, "id": hello_id}
+        
+        async def read_reply() -> Dict[str, Any]:
+            while True:
+                message = _decode_message(await self.receive_full_response())
+                # Skip the status update an older extension sends first
+                if isinstance(message, dict) and message.get("id") == hello_id and "method" not in message:
+                    return message
+        
+        self.writer.write(_encode_message(hello) + b'\n')
+        try:
+            await asyncio.wait_for(self.writer.drain(), timeout=WRITE_TIMEOUT)
+            reply = await asyncio.wait_for(read_reply(), timeout=HELLO_TIMEOUT)
+        except asyncio.TimeoutError:
+            return None
+        
+        result = reply.get("result")
+        accepted = isinstance(result, dict) and result.get("content_type") == _MSGPACK_CONTENT_TYPE
+        logger.info("Using %s framing", "msgpack" if accepted else "JSON")
+        return accepted
+
+    def disconnect(self, reason: Optional[BaseException] = None):
+        """Disconnect from the Sketchup extension
+
+        Requests still waiting for a response fail with a connection error
+        so their callers can retry on a new connection.
+        """
+        if self._reader_task:
+            self._reader_task.cancel()
+            self._reader_task = None
+        if self.writer:
             try:
-                self.sock.close()
+                self.writer.close()
             except Exception as e:
-                logger.error(f"Error disconnecting from Sketchup: {str(e)}")
+                logger.error("Error disconnecting from Sketchup: %s", e)
             finally:
-                self.sock = None
+                self.reader = self.writer = None
+            logger.info("Disconnected from Sketchup")
+        if self._pending:
+            error = ConnectionResetError(f"Connection to Sketchup closed: {reason}" if reason else "Connection to Sketchup closed")
+            for pending in self._pending.values():
+                pending.fail(error)
 
-    def receive_full_response(self, sock, buffer_size=8192):
-        """Receive the complete response, potentially in multiple chunks"""
-        chunks = []
-        sock.settimeout(30.0)  # Increased timeout for better reliability
-        
+    async def receive_full_response(self) -> bytes:
+        """Receive one complete response frame
+
+        Responses are framed as a single line of JSON terminated by a newline
+        (the Sketchup extension writes every message this way), or as a
+        length-prefixed msgpack payload once that has been negotiated. The
+        stream reader buffers partial data and only searches newly received
+        bytes for the delimiter, and anything past it stays buffered for the
+        next call, since a status update and the final result can arrive in
+        a single read. The frame is parsed once by the caller.
+        """
         try:
-            response_start_time = time.time()
-            max_response_time = 120.0  # Maximum 2 minutes to receive complete response
-            
-            while time.time() - response_start_time < max_response_time:
-                try:
-                    chunk = sock.recv(buffer_size)
-                    if not chunk:
-                        if not chunks:
-                            logger.warning("Connection closed before receiving any data")
-                            raise Exception("Connection closed before receiving any data")
-                        logger.info("Received end of response (no more data)")
-                        break
-                    
-                    chunks.append(chunk)
-                    logger.debug(f"Received chunk of {len(chunk)} bytes")
-                    
-                    try:
-                        data = b''.join(chunks)
-                        response_text = data.decode('utf-8')
-                        
-                        # Check if we have a complete JSON response
-                        json.loads(response_text)
-                        logger.info(f"Received complete response ({len(data)} bytes)")
-                        return data
-                    except json.JSONDecodeError:
-                        # Not complete yet, continue receiving
-                        continue
-                    except UnicodeDecodeError:
-                        # Partial UTF-8 sequence, continue receiving
-                        continue
-                        
-                except socket.timeout:
-                    logger.warning("Socket timeout during chunked receive")
-                    # Check if we have partial data and can parse it
-                    if chunks:
-                        try:
-                            data = b''.join(chunks)
-                            response_text = data.decode('utf-8')
-                            json.loads(response_text)
-                            logger.info("Timeout occurred but received complete response")
-                            return data
-                        except (json.JSONDecodeError, UnicodeDecodeError):
-                            logger.warning("Timeout with incomplete data, continuing...")
-                            continue
-                    else:
-                        logger.warning("Timeout with no data received")
-                        break
-                except (ConnectionError, BrokenPipeError, ConnectionResetError) as e:
-                    logger.error(f"Socket connection error during receive: {str(e)}")
-                    if chunks:
-                        logger.info("Connection lost but attempting to parse received data...")
-                        try:
-                            data = b''.join(chunks)
-                            response_text = data.decode('utf-8')
-                            json.loads(response_text)
-                            logger.info("Successfully parsed data despite connection loss")
-                            return data
-                        except (json.JSONDecodeError, UnicodeDecodeError):
-                            pass
-                    raise
-                    
-        except socket.timeout:
-            logger.warning("Overall timeout during chunked receive")
-        except Exception as e:
-            logger.error(f"Error during receive: {str(e)}")
+            if self._msgpack:
+                (length,) = _FRAME_HEADER.unpack(await self.reader.readexactly(_FRAME_HEADER.size))
+                if length > MAX_RESPONSE_SIZE:
+                    raise asyncio.LimitOverrunError("Frame exceeds the size limit", 0)
+                frame = await self.reader.readexactly(length)
+            else:
+                frame = await self.reader.readuntil(b'\n')
+            logger.debug("Received complete response (%d bytes)", len(frame))
+            return frame
+        except asyncio.IncompleteReadError as e:
+            if not e.partial:
+                # A clean close between frames, logged by the caller
+                raise ConnectionResetError("Sketchup closed the connection")
+            logger.error("Incomplete response received (%d bytes)", len(e.partial))
+            logger.error("Raw data (first 500 bytes): %r", e.partial[:500])
+            raise ConnectionResetError("Connection closed with an incomplete response")
+        except asyncio.LimitOverrunError:
+            logger.error("Response exceeds %d bytes", MAX_RESPONSE_SIZE)
+            raise Exception(f"Response exceeds {MAX_RESPONSE_SIZE} bytes")
+
+    async def _read_responses(self):
+        """Read frames for as long as the stream is open and dispatch them"""
+        try:
+            while True:
+                self._dispatch(await self.receive_full_response())
+        except asyncio.CancelledError:
             raise
+        except ConnectionResetError as e:
+            # The peer closed; any partial frame was already logged as an error
+            logger.info("Stopped reading responses: %s", e)
+            self._reader_task = None
+            self.disconnect(e)
+        except Exception as e:
+            logger.warning("Stopped reading responses: %s", e)
+            self._reader_task = None
+            self.disconnect(e)
+
+    def _dispatch(self, response_data: bytes):
+        """Route one response frame to the request waiting for it"""
+        self._last_ok_ts = time.monotonic()
+        
+        if self._msgpack:
+            # Binary frames have no text to peek into and are decoded whole
+            try:
+                response = msgpack.unpackb(response_data, raw=False)
+            except ValueError as e:
+                logger.error("Invalid msgpack in response: %s", e)
+                logger.error("Raw response (first 200 bytes): %r", response_data[:200])
+                return
+        else:
+            # Skip responses nobody is waiting for without building their
+            # (possibly large) result trees
+            response_id, response_method = _peek_id_method(response_data)
+            if response_method is None and response_id is not _UNKNOWN_ID:
+                pending = self._pending.get(response_id)
+                if pending is None:
+                    # A null id is an error for a request the extension
+                    # could not parse, decoded below
+                    if response_id is not None:
+                        logger.warning("Ignoring response for another request (id=%s)", response_id)
+                        return
+                elif pending.raw:
+                    raw_result = _raw_result(response_data)
+                    if raw_result is not None:
+                        pending.resolve(raw_result)
+                        return
             
-        # Try to parse what we have
-        if chunks:
-            data = b''.join(chunks)
-            logger.info(f"Attempting to parse received data ({len(data)} bytes)")
             try:
-                response_text = data.decode('utf-8')
-                json.loads(response_text)
-                logger.info("Successfully parsed received data")
-                return data
+                response = _decode_message(response_data)
             except json.JSONDecodeError as e:
-                logger.error(f"Incomplete JSON response received: {str(e)}")
-                logger.error(f"Raw data (first 500 chars): {response_text[:500]}")
-                raise Exception("Incomplete JSON response received")
-            except UnicodeDecodeError as e:
-                logger.error(f"Invalid UTF-8 in response: {str(e)}")
-                raise Exception("Invalid response encoding")
+                logger.error("Invalid JSON in response: %s", e)
+                logger.error("Raw response (first 200 bytes): %r", response_data[:200])
+                return
+        logger.debug("Response parsed: %s", response)
+        
+        # A batch request is answered with an array of responses
+        if isinstance(response, list):
+            for message in response:
+                if isinstance(message, dict):
+                    self._dispatch_message(message)
+        elif isinstance(response, dict):
+            self._dispatch_message(response)
         else:
-            logger.error("No data received")
-            raise Exception("No data received")
-
-    def send_command(self, method: str, params: Dict[str, Any] = None, request_id: Any = None) -> Dict[str, Any]:
-        """Send a JSON-RPC request to Sketchup and return the response"""
-        # Try to connect if not connected
-        if not self.connect():
-            raise ConnectionError("Not connected to Sketchup")
+            logger.warning("Unexpected response format: %s", response)
+
+    def _pending_for(self, message_id: Any) -> Optional[_PendingRequest]:
+        """The request waiting on message_id, if it is one of ours"""
+        if isinstance(message_id, (int, str)):
+            return self._pending.get(message_id)
+        return None
+
+    def _dispatch_message(self, response: Dict[str, Any]):
+        """Resolve the pending request a decoded response belongs to"""
+        # Check if this is a status update for a long-running operation
+        if response.get("method") == "operation/status":
+            status_params = response.get("params")
+            if not isinstance(status_params, dict):
+                logger.warning("Unexpected status update format: %s", response)
+                return
+            pending = self._pending_for(status_params.get("request_id"))
+            operation_id = status_params.get("operation_id")
+            status = status_params.get("status")
+            message = status_params.get("message", "")
+            
+            logger.debug("Operation %s status: %s - %s", operation_id, status, message)
+            
+            if pending is None:
+                return
+            pending.operation_id = operation_id
+            if status == "failed":
+                pending.fail(SketchupError(f"Operation failed: {message}"))
+            elif status == "completed":
+                # This shouldn't happen in status updates, but handle it
+                logger.debug("Operation completed via status update")
+                pending.resolve(status_params.get("result", {}))
+            # For "running" status, keep waiting
+            return
         
+        # Anything malformed from here on fails only the request it names
+        pending = self._pending_for(response.get("id"))
+        if pending is None and response.get("id") is None and "error" in response:
+            self._fail_unattributed(response["error"])
+        elif pending is None:
+            logger.warning("Unexpected response format: %s", response)
+        elif "error" in response:
+            # Check if this is an error response
+            error = response["error"]
+            logger.error("Sketchup error: %s", error)
+            if isinstance(error, dict):
+                pending.fail(SketchupError(error.get("message", "Unknown error from Sketchup")))
+            else:
+                pending.fail(SketchupError(str(error) or "Unknown error from Sketchup"))
+        elif "result" in response:
+            logger.debug("Received final result response")
+            pending.resolve(response.get("result", {}))
+        else:
+            logger.warning("Unexpected response format: %s", response)
+            pending.fail(SketchupError("Unexpected response format from Sketchup"))
+
+    def _fail_unattributed(self, error: Any):
+        """Fail the requests an error with a null id could belong to
+
+        The extension answers a request it could not parse with "id": null,
+        so it cannot say which one that was. Requests it has acknowledged
+        with a status update were parsed; every other one on the connection
+        is failed rather than left to time out.
+        """
+        logger.error("Sketchup error for an unidentified request: %s", error)
+        message = error.get("message") if isinstance(error, dict) else str(error)
+        exc = SketchupError(message or "Unknown error from Sketchup")
+        for pending in list(self._pending.values()):
+            if pending.writer is self.writer and pending.operation_id is None:
+                pending.fail(exc)
+
+    @staticmethod
+    def _build_request(method: str, params: Dict[str, Any] = None) -> _Call:
+        """Wrap a command in a JSON-RPC tools/call request"""
         # Ensure we're sending a proper JSON-RPC request
         if method == "tools/call" and params and "name" in params and "arguments" in params:
             # This is already in the correct format
-            request = {
-                "jsonrpc": "2.0",
-                "method": method,
-                "params": params,
-                "id": request_id
-            }
-        else:
-            # This is a direct command - convert to JSON-RPC
-            command_name = method
-            command_params = params or {}
+            return _Call(params["name"], params["arguments"])
+        
+        # This is a direct command - convert to JSON-RPC
+        logger.debug("Converting direct command '%s' to JSON-RPC format", method)
+        return _Call(method, params or {})
+
+    async def _write_requests(self, requests: List[_Call], raw: bool = False) -> List[_PendingRequest]:
+        """Register requests as pending and send them in a single write"""
+        async with self._lock:
+            # Try to connect if not connected
+            if not await self.connect():
+                raise ConnectionError("Could not connect to Sketchup. Make sure the Sketchup extension is running.")
             
-            # Log the conversion
-            logger.info(f"Converting direct command '{command_name}' to JSON-RPC format")
+            # A fresh id per attempt also keeps the extension's
+            # duplicate-request filter from dropping retries
+            wire_ids = [next(self._request_ids) for _ in requests]
+            logger.debug("Sending JSON-RPC request(s) %s: %s", wire_ids, [request.name for request in requests])
             
-            request = {
-                "jsonrpc": "2.0",
-                "method": "tools/call",
-                "params": {
-                    "name": command_name,
-                    "arguments": command_params
-                },
-                "id": request_id
-            }
-        
-        # Determine appropriate timeout based on operation
-        operation_timeout = 120.0  # Default 2 minutes
-        if method == "tools/call" and params:
-            tool_name = params.get("name")
-            if tool_name == "create_component":
-                operation_timeout = 60.0  # 1 minute for component creation
-            elif tool_name in ["boolean_operation", "create_dovetail", "create_mortise_tenon", "create_finger_joint"]:
-                operation_timeout = 180.0  # 3 minutes for complex operations
-            elif tool_name == "eval_ruby":
-                operation_timeout = 300.0  # 5 minutes for Ruby evaluation
+            # Several requests go out as one JSON-RPC batch array
+            # Requests were encoded for the framing in use before the lock was
+            # taken; a reconnect that changed it re-encodes them here
+            if self._msgpack:
+                messages = [request.pack(wire_id) for request, wire_id in zip(requests, wire_ids)]
+                if len(messages) > 1:
+                    messages.insert(0, msgpack.Packer().pack_array_header(len(messages)))
+                payload = b''.join(messages)
+                request_bytes = _FRAME_HEADER.pack(len(payload)) + payload
+            else:
+                if len(requests) == 1:
+                    request_bytes = requests[0].frame(wire_ids[0], b'}\n')
+                else:
+                    frames = [request.frame(wire_id) for request, wire_id in zip(requests, wire_ids)]
+                    request_bytes = b'[' + b','.join(frames) + b']\n'
+            
+            # Log the exact bytes being sent
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Raw bytes being sent: %r", request_bytes)
+            
+            # Register before writing, as a fast response could otherwise
+            # arrive before anyone is waiting for it
+            loop = asyncio.get_running_loop()
+            pendings = [_PendingRequest(wire_id, self.writer, loop.create_future(), raw) for wire_id in wire_ids]
+            for pending in pendings:
+                self._pending[pending.wire_id] = pending
+            
+            try:
+                self.writer.write(request_bytes)
+                await asyncio.wait_for(self.writer.drain(), timeout=WRITE_TIMEOUT)
+            except BaseException:
+                for pending in pendings:
+                    self._pending.pop(pending.wire_id, None)
+                raise
+            logger.debug("%d request(s) sent, waiting for response...", len(requests))
+            return pendings
+
+    async def send_batch(self, commands: List[Tuple[str, Dict[str, Any]]], request_id: Any = None, raw: bool = False) -> List[Any]:
+        """Send several commands as one JSON-RPC batch and return their results in order
+
+        Requests are pipelined: each one is tagged with a connection-unique
+        id and a single reader task hands responses to whichever request
+        they belong to, so concurrent calls share the socket without waiting
+        on each other. Commands that fail leave their exception in place of
+        a result; those lost to a dropped connection are resent. request_id
+        is the caller's id, used for logs. With raw, results on a JSON
+        stream are the bytes Sketchup sent, for callers that only pass them
+        on.
+        """
+        requests = [self._build_request(method, params) for method, params in commands]
+        if not requests:
+            return []
+        # The extension runs a batch's calls one after another
+        operation_timeout = sum(_TOOL_TIMEOUTS.get(request.name, _DEFAULT_TIMEOUT) for request in requests)
+        results: List[Any] = [None] * len(requests)
+        # A request that cannot be encoded fails alone; the connection is
+        # not touched for it
+        for i, request in enumerate(requests):
+            try:
+                request.encode(self._msgpack)
+            except (TypeError, ValueError, OverflowError) as e:
+                logger.error("Could not encode %s request: %s", request.name, e)
+                results[i] = SketchupError(f"Could not encode {request.name} request: {str(e)}")
+        remaining = [i for i, result in enumerate(results) if result is None]
+        if not remaining:
+            return results
+        # One deadline covers every attempt, so a resend only gets whatever
+        # is left of the operation timeout
+        deadline = time.monotonic() + operation_timeout
         
         # Maximum number of retries
-        max_retries = 3  # Increased from 2
+        max_retries = MAX_RETRIES
         retry_count = 0
         
-        while retry_count <= max_retries:
+        while True:
+            logger.debug("Sending %d request(s) for %s (attempt %d/%d)", len(remaining), request_id, retry_count + 1, max_retries + 1)
+            pendings = []
+            error = None
             try:
-                logger.info(f"Sending JSON-RPC request (attempt {retry_count + 1}/{max_retries + 1}): {request}")
-                
-                # Log the exact bytes being sent
-                request_bytes = json.dumps(request).encode('utf-8') + b'\n'
-                logger.info(f"Raw bytes being sent: {request_bytes}")
+                pendings = await self._write_requests([requests[i] for i in remaining], raw)
+                await asyncio.wait([pending.future for pending in pendings], timeout=max(0.05, deadline - time.monotonic()))
                 
-                # Send with increased timeout for socket operations
-                self.sock.settimeout(30.0)
-                self.sock.sendall(request_bytes)
-                logger.info(f"Request sent, waiting for response...")
-                
-                # Set longer timeout for receiving response
-                self.sock.settimeout(operation_timeout)
-                
-                # Handle potentially multiple responses for long-running operations
-                final_result = None
-                operation_id = None
-                start_time = time.time()
-                
-                while time.time() - start_time < operation_timeout:
-                    try:
-                        response_data = self.receive_full_response(self.sock)
-                        logger.info(f"Received {len(response_data)} bytes of data")
-                        
-                        response = json.loads(response_data.decode('utf-8'))
-                        logger.info(f"Response parsed: {response}")
-                        
-                        # Check if this is an error response
-                        if "error" in response:
-                            logger.error(f"Sketchup error: {response['error']}")
-                            raise Exception(response["error"].get("message", "Unknown error from Sketchup"))
-                        
-                        # Check if this is a status update for a long-running operation
-                        if response.get("method") == "operation/status":
-                            status_params = response.get("params", {})
-                            operation_id = status_params.get("operation_id")
-                            status = status_params.get("status")
-                            message = status_params.get("message", "")
-                            
-                            logger.info(f"Operation {operation_id} status: {status} - {message}")
-                            
-                            if status == "failed":
-                                raise Exception(f"Operation failed: {message}")
-                            elif status == "completed":
-                                # This shouldn't happen in status updates, but handle it
-                                logger.info("Operation completed via status update")
-                                return status_params.get("result", {})
-                            # For "running" status, continue waiting
-                            continue
-                        
-                        # Check if this is a final result response
-                        elif "result" in response and response.get("id") == request_id:
-                            logger.info("Received final result response")
-                            return response.get("result", {})
-                        
-                        # If we get here, it might be an unexpected response
-                        logger.warning(f"Unexpected response format: {response}")
-                        
-                    except socket.timeout:
-                        logger.info("Timeout waiting for response, checking if operation is still running...")
-                        # For short operations like create_component, don't wait too long
-                        if method == "tools/call" and params and params.get("name") == "create_component":
-                            if time.time() - start_time > 30.0:  # Only wait 30 seconds for component creation
-                                logger.warning("Component creation taking too long, timing out")
-                                break
-                        continue
-                    except json.JSONDecodeError as e:
-                        logger.error(f"Invalid JSON in response: {str(e)}")
-                        continue
-                
-                # If we get here, we timed out waiting for the final result
-                if operation_id:
-                    raise Exception(f"Operation {operation_id} timed out after {operation_timeout} seconds")
-                else:
-                    raise Exception(f"No response received within {operation_timeout} seconds")
+                lost = []
+                for i, pending in zip(remaining, pendings):
+                    future = pending.future
+                    if not future.done():
+                        # The late response, if any, is dropped by the reader
+                        if pending.operation_id:
+                            results[i] = SketchupError(f"Operation {pending.operation_id} timed out after {operation_timeout} seconds")
+                        else:
+                            results[i] = SketchupError(f"No response received within {operation_timeout} seconds")
+                    elif isinstance(future.exception(), ConnectionError):
+                        error = future.exception()
+                        lost.append(i)
+                    elif future.exception() is not None:
+                        results[i] = future.exception()
+                    else:
+                        results[i] = future.result()
+                remaining = lost
+                if not remaining:
+                    return results
                 
-            except (socket.timeout, ConnectionError, BrokenPipeError, ConnectionResetError) as e:
-                logger.warning(f"Connection error (attempt {retry_count+1}/{max_retries+1}): {str(e)}")
-                retry_count += 1
+            except (asyncio.TimeoutError, OSError) as e:
+                error = e
                 
-                if retry_count <= max_retries:
-                    logger.info(f"Retrying connection...")
-                    self.disconnect()
-                    time.sleep(min(retry_count * 0.5, 2.0))  # Progressive backoff
-                    if not self.connect():
-                        logger.error("Failed to reconnect")
-                        continue
-                else:
-                    logger.error(f"Max retries reached, giving up")
-                    self.sock = None
-                    raise Exception(f"Connection to Sketchup lost after {max_retries+1} attempts: {str(e)}")
+            except Exception as e:
+                # Not a transport error, so the shared connection is left up
+                logger.error("Error communicating with Sketchup: %s", e)
+                raise Exception(f"Communication error with Sketchup: {str(e)}")
             
-            except json.JSONDecodeError as e:
-                logger.error(f"Invalid JSON response from Sketchup: {str(e)}")
-                if 'response_data' in locals() and response_data:
-                    logger.error(f"Raw response (first 200 bytes): {response_data[:200]}")
-                raise Exception(f"Invalid response from Sketchup: {str(e)}")
+            finally:
+                for pending in pendings:
+                    self._pending.pop(pending.wire_id, None)
             
-            except Exception as e:
-                logger.error(f"Error communicating with Sketchup: {str(e)}")
-                # For some errors, try reconnecting
-                if "Connection closed" in str(e) and retry_count < max_retries:
-                    logger.info("Connection closed error, attempting reconnect...")
-                    retry_count += 1
+            logger.warning("Connection error (attempt %d/%d): %s", retry_count + 1, max_retries + 1, error)
+            retry_count += 1
+            backoff = min(retry_count * RETRY_BACKOFF_STEP, RETRY_BACKOFF_MAX)  # Progressive backoff
+            
+            # Retries must not stretch the call past the operation timeout
+            if retry_count <= max_retries and time.monotonic() + backoff <= deadline:
+                logger.info("Retrying connection...")
+                # Another request may already have reconnected
+                if self.writer is not None and (not pendings or pendings[0].writer is self.writer):
                     self.disconnect()
-                    time.sleep(0.5)
-                    if self.connect():
-                        continue
-                
-                self.sock = None
-                raise Exception(f"Communication error with Sketchup: {str(e)}")
+                await asyncio.sleep(backoff)
+            else:
+                logger.error("Retries exhausted, giving up")
+                self.disconnect()
+                lost_error = Exception(f"Connection to Sketchup lost after {retry_count} attempts: {str(error)}")
+                for i in remaining:
+                    results[i] = lost_error
+                return results
 
-# Global connection management
-_sketchup_connection = None
+    def batch(self, request_id: Any = None) -> "CommandBatch":
+        """Queue the commands sent inside an ``async with`` block and send them as one batch"""
+        return CommandBatch(self, request_id)
 
-def get_sketchup_connection():
-    """Get or create a persistent Sketchup connection"""
-    global _sketchup_connection
-    
-    if _sketchup_connection is not None:
-        logger.info("Testing existing connection...")
+    async def send_command(self, method: str, params: Dict[str, Any] = None, request_id: Any = None, raw: bool = False, wait: bool = True) -> Any:
+        """Send a JSON-RPC request to Sketchup and return the response
+
+        With raw, the result may be returned as the JSON bytes Sketchup sent.
+        Without wait, the request is only queued on the socket and a
+        placeholder result is returned at once; see _send_nowait.
+        """
+        if not wait:
+            await self._send_nowait(self._build_request(method, params), request_id)
+            return {"success": True, "queued": True}
+        result = (await self.send_batch([(method, params)], request_id=request_id, raw=raw))[0]
+        if isinstance(result, SketchupError):
+            # The connection is fine; only this request failed
+            logger.error("Error communicating with Sketchup: %s", result)
+            raise Exception(f"Communication error with Sketchup: {str(result)}")
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def _send_nowait(self, request: _Call, request_id: Any = None):
+        """Write a request and leave its response to the reader task
+
+        The response is dropped when it arrives and failures are only
+        logged; a request that is never answered is given up on after its
+        tool's timeout. Nothing is resent if the connection drops.
+        """
+        request.encode(self._msgpack)
+        (pending,) = await self._write_requests([request], raw=True)
+        timeout = _TOOL_TIMEOUTS.get(request.name, _DEFAULT_TIMEOUT)
+        expiry = asyncio.get_running_loop().call_later(
+            timeout, pending.fail, SketchupError(f"Operation timed out after {timeout} seconds")
+        )
+        
+        def forget(future: asyncio.Future):
+            expiry.cancel()
+            self._pending.pop(pending.wire_id, None)
+            if not future.cancelled() and future.exception() is not None:
+                logger.warning("Queued %s (request_id=%s) failed: %s", request.name, request_id, future.exception())
+        
+        pending.future.add_done_callback(forget)
+
+class CommandBatch:
+    """Commands queued to go to Sketchup together
+
+    Usage::
+
+        async with sketchup.batch(request_id=ctx.request_id) as batch:
+            markers = batch.send_command("tools/call", {...})
+            bounds = batch.send_command("tools/call", {...})
+        markers.result(), bounds.result()
+
+    send_command returns a future that is settled when the block exits,
+    with the result or the same exception SketchupConnection.send_command
+    would raise.
+    """
+    __slots__ = ("connection", "request_id", "_commands", "_futures")
+
+    def __init__(self, connection: SketchupConnection, request_id: Any = None):
+        self.connection = connection
+        self.request_id = request_id
+        self._commands: List[Tuple[str, Dict[str, Any]]] = []
+        self._futures: List[asyncio.Future] = []
+
+    def send_command(self, method: str, params: Dict[str, Any] = None) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self._commands.append((method, params))
+        self._futures.append(future)
+        return future
+
+    async def __aenter__(self) -> "CommandBatch":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if exc_type is not None or not self._commands:
+            for future in self._futures:
+                future.cancel()
+            return
         try:
-            # Test if the socket is still valid by checking its state
-            if _sketchup_connection.sock and _sketchup_connection.sock.fileno() != -1:
-                logger.info("Existing connection appears valid")
-                return _sketchup_connection
-            else:
-                logger.warning("Existing connection socket is invalid")
-                _sketchup_connection = None
+            results = await self.connection.send_batch(self._commands, request_id=self.request_id)
         except Exception as e:
-            logger.warning(f"Existing connection test failed: {str(e)}")
-            try:
-                _sketchup_connection.disconnect()
-            except:
-                pass
-            _sketchup_connection = None
-    
-    if _sketchup_connection is None:
-        logger.info("Creating new connection to Sketchup...")
-        _sketchup_connection = SketchupConnection(host="localhost", port=9876)
-        logger.info("About to call connect()...")
-        if not _sketchup_connection.connect():
-            logger.error("Failed to connect to Sketchup")
-            _sketchup_connection = None
-            raise Exception("Could not connect to Sketchup. Make sure the Sketchup extension is running.")
-        logger.info("Connect() completed successfully")
-        logger.info("Created new persistent connection to Sketchup")
+            results = [e] * len(self._futures)
+        for future, result in zip(self._futures, results):
+            if isinstance(result, SketchupError):
+                future.set_exception(Exception(f"Communication error with Sketchup: {str(result)}"))
+            elif isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+# Global connection management: one persistent connection per extension
+# address, shared by every tool call since requests are multiplexed over it
+_connections: Dict[Tuple[str, int], SketchupConnection] = {}
+
+async def get_sketchup_connection(host: str = "localhost", port: int = 9876) -> SketchupConnection:
+    """Get or create the persistent connection to a Sketchup extension"""
+    connection = _connections.get((host, port))
+    if connection is None:
+        logger.debug("Creating new connection to Sketchup...")
+        connection = _connections[(host, port)] = SketchupConnection(host=host, port=port)
     
-    return _sketchup_connection
+    # Every write connects or reconnects as needed, so no probe is made here
+    return connection
+
+def close_all():
+    """Close every persistent Sketchup connection"""
+    while _connections:
+        _, connection = _connections.popitem()
+        try:
+            connection.disconnect()
+        except Exception as e:
+            logger.error("Error closing connection to %s:%s: %s", connection.host, connection.port, e)
 
 @asynccontextmanager
 async def server_lifespan(server: FastMCP) -> AsyncIterator[Dict[str, Any]]:
@@ -384,11 +820,8 @@ async def server_lifespan(server: FastMCP) -> AsyncIterator[Dict[str, Any]]:
         yield {}
     finally:
         logger.info("Server shutdown initiated")
-        global _sketchup_connection
-        if _sketchup_connection:
-            logger.info("Disconnecting from Sketchup")
-            _sketchup_connection.disconnect()
-            _sketchup_connection = None
+        logger.info("Disconnecting from Sketchup")
+        close_all()
         logger.info("SketchupMCP server shut down")
 
 # Create MCP server with lifespan support
@@ -399,8 +832,107 @@ mcp = FastMCP(
 )
 
 # Tool endpoints
+async def _invoke(ctx: Context, name: str, arguments: Dict[str, Any], wait: bool = True) -> str:
+    """Call a Sketchup tool and return its result as JSON
+
+    The result is passed on as Sketchup encoded it, without being parsed
+    and serialized again. Without wait, the call is only queued.
+    """
+    sketchup = await get_sketchup_connection()
+    result = await sketchup.send_command(
+        method="tools/call",
+        params={
+            "name": name,
+            "arguments": arguments
+        },
+        request_id=ctx.request_id,
+        raw=True,
+        wait=wait
+    )
+    logger.debug("%s result: %s", name, result)
+    return result.decode('utf-8') if isinstance(result, bytes) else _dumps(result)
+
+def rpc(name: str, error: str, queueable: bool = False):
+    """Turn a function that builds a Sketchup tool's arguments into the tool call
+
+    The decorated function takes the MCP tool's parameters and returns the
+    arguments for the Sketchup tool `name`. The wrapper sends them and returns
+    the JSON result, or "<error>: <reason>" if anything fails. The signature
+    and docstring are kept for FastMCP, with the return type set to str.
+
+    A queueable tool also takes a `wait` parameter; with wait=False the call
+    is sent without waiting for Sketchup's reply, for visual side effects
+    whose result the caller doesn't need.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(ctx: Context, *args, wait: bool = True, **kwargs) -> str:
+            try:
+                return await _invoke(ctx, name, fn(ctx, *args, **kwargs), wait)
+            except Exception as e:
+                logger.error("Error in %s: %s", fn.__name__, e)
+                return f"{error}: {str(e)}"
+        signature = inspect.signature(fn)
+        parameters = list(signature.parameters.values())
+        if queueable:
+            parameters.append(inspect.Parameter("wait", inspect.Parameter.KEYWORD_ONLY, default=True, annotation=bool))
+            wrapper.__doc__ = f"{fn.__doc__}\n\nWith wait=False the call is queued and returns {{\"success\": true, \"queued\": true}} without waiting for Sketchup."
+        wrapper.__signature__ = signature.replace(parameters=parameters, return_annotation=str)
+        return wrapper
+    return decorator
+
+# Accepted create_component options, in the order shown in error messages
+_DIRECTIONS = ("up", "down", "forward", "back", "right", "left", "auto")
+_ORIGIN_MODES = ("center", "bottom_center", "top_center", "min_corner", "max_corner")
+_VALID_DIRECTIONS = frozenset(_DIRECTIONS)
+_VALID_ORIGIN_MODES = frozenset(_ORIGIN_MODES)
+
+def _normalize_dims(type: str, dimensions: Optional[List[float]]) -> Tuple[float, float, float]:
+    """Expand dimensions to (width, height, depth), each at least 0.1
+
+    Cylinders accept [diameter, height]; other short lists repeat their last
+    value. The caller's list is left untouched.
+    """
+    if not dimensions:
+        return (1.0, 1.0, 1.0)
+    if type == "cylinder" and len(dimensions) == 2:
+        diameter, height = dimensions
+        diameter = max(0.1, float(diameter))
+        return (diameter, diameter, max(0.1, float(height)))
+    width, height, depth = (list(dimensions[:3]) + [dimensions[-1]] * 2)[:3]
+    return (max(0.1, float(width)), max(0.1, float(height)), max(0.1, float(depth)))
+
+def _component_arguments(
+    type: str = "cube",
+    position: List[float] = None,
+    dimensions: List[float] = None,
+    direction: str = "up",
+    origin_mode: str = "center"
+) -> Dict[str, Any]:
+    """Validate create_component parameters and build the tool arguments"""
+    # Validate and normalize dimensions before sending
+    dimensions = _normalize_dims(type, dimensions)
+    
+    # Validate direction parameter
+    if direction not in _VALID_DIRECTIONS:
+        raise ValueError(f"Invalid direction '{direction}'. Must be one of: {list(_DIRECTIONS)}")
+    
+    # Validate origin_mode parameter  
+    if origin_mode not in _VALID_ORIGIN_MODES:
+        raise ValueError(f"Invalid origin_mode '{origin_mode}'. Must be one of: {list(_ORIGIN_MODES)}")
+    
+    return {
+        "type": type,
+        "position": position or [0, 0, 0],
+        "dimensions": dimensions,
+        "direction": direction,
+        "origin_mode": origin_mode
+    }
+
+_COMPONENT_KEYS = frozenset(inspect.signature(_component_arguments).parameters)
+
 @mcp.tool()
-def create_component(
+async def create_component(
     ctx: Context,
     type: str = "cube",
     position: List[float] = None,
@@ -461,99 +993,192 @@ def create_component(
         origin_mode: How to interpret position ("center", "bottom_center", "top_center", "min_corner", "max_corner")
     """
     try:
-        logger.info(f"create_component called with type={type}, position={position}, dimensions={dimensions}, direction={direction}, origin_mode={origin_mode}, request_id={ctx.request_id}")
-        
-        # Validate and normalize dimensions before sending
-        if dimensions is None:
-            dimensions = [1, 1, 1]
-        elif len(dimensions) == 2 and type == "cylinder":
-            logger.info(f"Converting cylinder dimensions from {dimensions} to 3D format")
-            dimensions = [dimensions[0], dimensions[0], dimensions[1]]
-        elif len(dimensions) < 3:
-            while len(dimensions) < 3:
-                dimensions.append(dimensions[-1] if dimensions else 1.0)
-            logger.info(f"Padded dimensions to 3D: {dimensions}")
-        
-        dimensions = [max(0.1, float(d)) for d in dimensions]
+        request_id = ctx.request_id
+        logger.info("create_component called with type=%s, position=%s, dimensions=%s, direction=%s, origin_mode=%s, request_id=%s", type, position, dimensions, direction, origin_mode, request_id)
         
-        # Validate direction parameter
-        valid_directions = ["up", "down", "forward", "back", "right", "left", "auto"]
-        if direction not in valid_directions:
-            raise ValueError(f"Invalid direction '{direction}'. Must be one of: {valid_directions}")
+        # Validate before connecting so bad parameters fail fast
+        arguments = _component_arguments(type, position, dimensions, direction, origin_mode)
         
-        # Validate origin_mode parameter  
-        valid_origin_modes = ["center", "bottom_center", "top_center", "min_corner", "max_corner"]
-        if origin_mode not in valid_origin_modes:
-            raise ValueError(f"Invalid origin_mode '{origin_mode}'. Must be one of: {valid_origin_modes}")
-        
-        sketchup = get_sketchup_connection()
-        result = sketchup.send_command(
+        sketchup = await get_sketchup_connection()
+        result = await sketchup.send_command(
             method="tools/call",
             params={
                 "name": "create_component_with_verification",
-                "arguments": {
-                    "type": type,
-                    "position": position or [0, 0, 0],
-                    "dimensions": dimensions,
-                    "direction": direction,
-                    "origin_mode": origin_mode
-                }
+                "arguments": arguments
             },
-            request_id=ctx.request_id
+            request_id=request_id
         )
         
         if result and result.get("success"):
             component_id = result.get("id")
-            # Use original type for the message if not found in verification (should be there though)
-            comp_type_from_input = type.capitalize()
+            verification = result.get('verification') or {}
+            bounds_data = verification.get('bounds') or {}
             # Get type from verification if available, otherwise default to input type
-            comp_type_from_result = result.get('verification', {}).get('type', comp_type_from_input)
+            comp_type_from_result = verification.get('type')
             if isinstance(comp_type_from_result, str): # Ensure it's a string before capitalizing
                  comp_type_for_message = comp_type_from_result.capitalize()
             else: # Fallback if type is not a string (e.g. nil/None from Ruby)
-                 comp_type_for_message = comp_type_from_input
+                 comp_type_for_message = type.capitalize()
 
-            actual_center = result.get('verification', {}).get('bounds', {}).get('center', 'N/A')
-            bounds_data = result.get('verification', {}).get('bounds', {})
+            actual_center = bounds_data.get('center', 'N/A')
             dims_str = "N/A"
-            if bounds_data and all(k in bounds_data for k in ['width', 'height', 'depth']):
+            if all(k in bounds_data for k in ('width', 'height', 'depth')):
                 # Ensure values are converted to floats before formatting
-                width = float(bounds_data.get('width', 0)) if bounds_data.get('width') is not None else 0.0
-                height = float(bounds_data.get('height', 0)) if bounds_data.get('height') is not None else 0.0
-                depth = float(bounds_data.get('depth', 0)) if bounds_data.get('depth') is not None else 0.0
+                width, height, depth = (float(bounds_data[k] or 0) for k in ('width', 'height', 'depth'))
                 dims_str = f"[{width:.2f}, {height:.2f}, {depth:.2f}]"
 
             # Include directional info in message
-            directional_info = f"Created with direction='{direction}', origin_mode='{origin_mode}'. "
-            message = f"{comp_type_for_message} (ID: {component_id}) created. {directional_info}Actual center: {actual_center}, Dimensions (W,H,D): {dims_str}. {result.get('positioning_explanation', '')}"
+            message = (f"{comp_type_for_message} (ID: {component_id}) created. "
+                       f"Created with direction='{direction}', origin_mode='{origin_mode}'. "
+                       f"Actual center: {actual_center}, Dimensions (W,H,D): {dims_str}. {result.get('positioning_explanation', '')}")
             
             # Log the plain English message
-            logger.info(f"create_component successful: {message}")
+            logger.info("create_component successful: %s", message)
             
-            return json.dumps({
+            response = {
                 "message": message,
                 "details": result 
-            })
+            }
+            return _dumps(response)
         else:
             # If Sketchup reported failure
             error_message = result.get("error", "Unknown error during component creation.")
-            logger.error(f"Error in create_component (from Sketchup): {error_message}")
-            return json.dumps({
+            logger.error("Error in create_component (from Sketchup): %s", error_message)
+            return _dumps({
                 "message": f"Failed to create component: {error_message}",
                 "details": result
             })
 
     except Exception as e:
-        logger.error(f"Error in create_component (Python exception): {str(e)}")
+        logger.error("Error in create_component (Python exception): %s", e)
         # Ensure this path also returns a JSON string for consistency if possible
-        return json.dumps({
+        return _dumps({
             "message": f"Error creating component: {str(e)}",
             "error": True,
             "details": None
         })
 
 @mcp.tool()
-def delete_component(
+async def create_components(
+    ctx: Context,
+    components: List[Dict[str, Any]]
+) -> str:
+    """Create several components in Sketchup in a single round trip
+    
+    Each entry takes the same keys as create_component: type, position,
+    dimensions, direction and origin_mode. All requests are sent to Sketchup
+    together and created in order; one failing does not stop the others.
+    
+    Returns:
+        A JSON string with a 'message' summary and a 'results' list holding,
+        for each component in order, its ID on success or its error message.
+    
+    Args:
+        components: List of component specs, e.g.
+                    [{"type": "cube", "position": [0, 0, 0], "dimensions": [10, 10, 10]},
+                     {"type": "cylinder", "position": [20, 0, 0], "dimensions": [5, 10]}]
+    """
+    try:
+        logger.info("create_components called with %d components, request_id=%s", len(components), ctx.request_id)
+        
+        # Entries that fail validation get their error in place and are not sent
+        batch_results: List[Any] = []
+        commands = []
+        for component in components:
+            try:
+                if not isinstance(component, dict):
+                    raise ValueError("Each component must be an object")
+                unknown = sorted(set(component) - _COMPONENT_KEYS)
+                if unknown:
+                    raise ValueError(f"Unknown component parameter(s): {', '.join(unknown)}")
+                arguments = _component_arguments(**component)
+            except (TypeError, ValueError) as e:
+                batch_results.append(ValueError(f"Invalid component: {str(e)}"))
+                continue
+            batch_results.append(None)
+            commands.append(("tools/call", {
+                "name": "create_component_with_verification",
+                "arguments": arguments
+            }))
+        
+        if commands:
+            sketchup = await get_sketchup_connection()
+            sent = iter(await sketchup.send_batch(commands, request_id=ctx.request_id))
+            batch_results = [next(sent) if result is None else result for result in batch_results]
+        
+        results = []
+        for result in batch_results:
+            if isinstance(result, Exception):
+                results.append({"success": False, "error": str(result)})
+            elif result and result.get("success"):
+                results.append({"success": True, "id": result.get("id"), "details": result})
+            else:
+                results.append({"success": False, "error": (result or {}).get("error", "Unknown error during component creation."), "details": result})
+        
+        created = sum(1 for result in results if result["success"])
+        message = f"Created {created} of {len(results)} components."
+        logger.info("create_components finished: %s", message)
+        
+        return _dumps({
+            "message": message,
+            "results": results
+        })
+
+    except Exception as e:
+        logger.error("Error in create_components: %s", e)
+        return _dumps({
+            "message": f"Error creating components: {str(e)}",
+            "error": True,
+            "results": None
+        })
+
+@mcp.tool()
+async def batch_call(
+    ctx: Context,
+    calls: List[Dict[str, Any]]
+) -> str:
+    """Run several Sketchup tool calls in a single round trip
+    
+    The calls are sent to Sketchup as one JSON-RPC batch and run in order;
+    one failing does not stop the others.
+    
+    Returns:
+        A JSON string with a 'results' list holding, for each call in order,
+        the tool's result or {"success": false, "error": message}.
+    
+    Args:
+        calls: List of {"name": tool name, "arguments": {...}} using the Sketchup
+               extension's tool names, e.g.
+               [{"name": "create_reference_markers", "arguments": {"points": [[0, 0, 0]]}},
+                {"name": "query_all_components", "arguments": {}}]
+    """
+    try:
+        logger.info("batch_call called with %d calls, request_id=%s", len(calls), ctx.request_id)
+        
+        sketchup = await get_sketchup_connection()
+        async with sketchup.batch(request_id=ctx.request_id) as batch:
+            futures = [
+                batch.send_command("tools/call", {"name": call["name"], "arguments": call.get("arguments") or {}})
+                for call in calls
+            ]
+        
+        results = []
+        for future in futures:
+            if future.exception() is not None:
+                results.append({"success": False, "error": str(future.exception())})
+            else:
+                results.append(future.result())
+        
+        return _dumps({"results": results})
+    except Exception as e:
+        logger.error("Error in batch_call: %s", e)
+        return _dumps({
+            "success": False,
+            "error": str(e)
+        })
+
+@mcp.tool()
+async def delete_component(
     ctx: Context,
     id: str
 ) -> str:
@@ -568,8 +1193,8 @@ def delete_component(
         If a Python exception occurs, it returns an error message string.
     """
     try:
-        sketchup = get_sketchup_connection()
-        result = sketchup.send_command(
+        sketchup = await get_sketchup_connection()
+        result = await sketchup.send_command(
             method="tools/call",
             params={
                 "name": "delete_component",
@@ -581,29 +1206,29 @@ def delete_component(
         if result and result.get("success"):
             message = f"Component with ID '{id}' deleted successfully."
             logger.info(message)
-            return json.dumps({"message": message, "details": result})
+            return _dumps({"message": message, "details": result})
         elif result:
             # Sketchup processed but reported failure (e.g. ID not found)
             error_reason = result.get("message", f"Component ID '{id}' not found or another error occurred.")
             message = f"Failed to delete component with ID '{id}'. Reason: {error_reason}"
             logger.warning(message)
-            return json.dumps({"message": message, "details": result})
+            return _dumps({"message": message, "details": result})
         else:
             # Should not happen if send_command works, but as a fallback
             message = f"Received an unexpected or empty response when trying to delete component ID '{id}'."
             logger.error(message)
-            return json.dumps({"message": message, "error": True, "details": None})
+            return _dumps({"message": message, "error": True, "details": None})
             
     except Exception as e:
-        logger.error(f"Error in delete_component for ID '{id}': {str(e)}")
-        return json.dumps({
+        logger.error("Error in delete_component for ID '%s': %s", id, e)
+        return _dumps({
             "message": f"Error deleting component ID '{id}': {str(e)}",
             "error": True,
             "details": None
         })
 
 @mcp.tool()
-def transform_component(
+async def transform_component(
     ctx: Context,
     id: str,
     position: List[float] = None,
@@ -629,7 +1254,7 @@ def transform_component(
         On failure, includes an error 'message' and 'details'.
     """
     try:
-        sketchup = get_sketchup_connection()
+        sketchup = await get_sketchup_connection()
         arguments = {"id": id}
         applied_transformations = []
 
@@ -646,9 +1271,9 @@ def transform_component(
         if not applied_transformations:
             message = "No transformation (position, rotation, or scale) provided. Component not changed."
             logger.info(message)
-            return json.dumps({"message": message, "details": {"success": True, "id": id, "changes_applied": False}})
+            return _dumps({"message": message, "details": {"success": True, "id": id, "changes_applied": False}})
 
-        result = sketchup.send_command(
+        result = await sketchup.send_command(
             method="tools/call",
             params={
                 "name": "transform_component",
@@ -663,38 +1288,42 @@ def transform_component(
             # Optionally, include new state if returned: e.g., result.get('new_position')
             # For now, a generic success message based on inputs.
             logger.info(message)
-            return json.dumps({"message": message, "details": result})
+            return _dumps({"message": message, "details": result})
         elif result:
             error_reason = result.get("message", f"Component ID '{id}' not found or transform failed.")
             message = f"Failed to transform component ID '{id}'. Reason: {error_reason}"
             logger.warning(message)
-            return json.dumps({"message": message, "details": result})
+            return _dumps({"message": message, "details": result})
         else:
             message = f"Received an unexpected or empty response when trying to transform component ID '{id}'."
             logger.error(message)
-            return json.dumps({"message": message, "error": True, "details": None})
+            return _dumps({"message": message, "error": True, "details": None})
 
     except Exception as e:
-        logger.error(f"Error in transform_component for ID '{id}': {str(e)}")
-        return json.dumps({
+        logger.error("Error in transform_component for ID '%s': %s", id, e)
+        return _dumps({
             "message": f"Error transforming component ID '{id}': {str(e)}",
             "error": True,
             "details": None
         })
 
+# Selections larger than this are counted rather than listed in the message
+_SELECTION_LIST_LIMIT = 1000
+
 @mcp.tool()
-def get_selection(ctx: Context) -> str:
+async def get_selection(ctx: Context) -> str:
     """Get currently selected components in SketchUp.
 
     Returns:
-        A JSON string. On success, includes a 'message' listing selected components by ID and type,
+        A JSON string. On success, includes a 'message' listing selected components by ID and type
+        (only their count for very large selections),
         and 'details' with the full structured selection data from SketchUp.
         If no components are selected, the message will indicate this.
         On failure, an error message string is returned.
     """
     try:
-        sketchup = get_sketchup_connection()
-        result = sketchup.send_command(
+        sketchup = await get_sketchup_connection()
+        result = await sketchup.send_command(
             method="tools/call",
             params={
                 "name": "get_selection",
@@ -705,37 +1334,38 @@ def get_selection(ctx: Context) -> str:
         
         if result and result.get("success"):
             selected_items = result.get("selection", [])
-            if selected_items:
-                item_descs = []
-                for item in selected_items:
-                    item_id = item.get("id", "Unknown ID")
-                    item_type = item.get("type", "Entity") # Assuming Sketchup provides type
-                    item_descs.append(f"{item_type} (ID: {item_id})")
+            if len(selected_items) > _SELECTION_LIST_LIMIT:
+                # Too many to list; the items are all in details
+                message = f"Currently selected components ({len(selected_items)})."
+            elif selected_items:
+                get = dict.get
+                # Assuming Sketchup provides type
+                item_descs = [f"{get(item, 'type', 'Entity')} (ID: {get(item, 'id', 'Unknown ID')})" for item in selected_items]
                 message = f"Currently selected components ({len(selected_items)}): {', '.join(item_descs)}."
             else:
                 message = "No components are currently selected."
             logger.info(message)
-            return json.dumps({"message": message, "details": result})
+            return _dumps({"message": message, "details": result})
         elif result: # Failure reported by Sketchup
             error_reason = result.get("message", "Failed to retrieve selection from Sketchup.")
             message = f"Could not retrieve selection. Reason: {error_reason}"
             logger.warning(message)
-            return json.dumps({"message": message, "details": result})
+            return _dumps({"message": message, "details": result})
         else:
             message = "Received an unexpected or empty response when trying to get selection."
             logger.error(message)
-            return json.dumps({"message": message, "error": True, "details": None})
+            return _dumps({"message": message, "error": True, "details": None})
 
     except Exception as e:
-        logger.error(f"Error in get_selection: {str(e)}")
-        return json.dumps({
+        logger.error("Error in get_selection: %s", e)
+        return _dumps({
             "message": f"Error getting selection: {str(e)}",
             "error": True,
             "details": None
         })
 
 @mcp.tool()
-def set_material(
+async def set_material(
     ctx: Context,
     id: str,
     material: str
@@ -752,8 +1382,8 @@ def set_material(
         On failure, includes an error 'message' and 'details'.
     """
     try:
-        sketchup = get_sketchup_connection()
-        result = sketchup.send_command(
+        sketchup = await get_sketchup_connection()
+        result = await sketchup.send_command(
             method="tools/call",
             params={
                 "name": "set_material",
@@ -768,27 +1398,27 @@ def set_material(
         if result and result.get("success"):
             message = f"Material for component ID '{id}' successfully set to '{material}'."
             logger.info(message)
-            return json.dumps({"message": message, "details": result})
+            return _dumps({"message": message, "details": result})
         elif result:
             error_reason = result.get("message", f"Component ID '{id}' or material '{material}' not found, or another error occurred.")
             message = f"Failed to set material '{material}' for component ID '{id}'. Reason: {error_reason}"
             logger.warning(message)
-            return json.dumps({"message": message, "details": result})
+            return _dumps({"message": message, "details": result})
         else:
             message = f"Received an unexpected or empty response when trying to set material for component ID '{id}'."
             logger.error(message)
-            return json.dumps({"message": message, "error": True, "details": None})
+            return _dumps({"message": message, "error": True, "details": None})
 
     except Exception as e:
-        logger.error(f"Error in set_material for ID '{id}' with material '{material}': {str(e)}")
-        return json.dumps({
+        logger.error("Error in set_material for ID '%s' with material '%s': %s", id, material, e)
+        return _dumps({
             "message": f"Error setting material for component ID '{id}': {str(e)}",
             "error": True,
             "details": None
         })
 
 @mcp.tool()
-def export_scene(
+async def export_scene(
     ctx: Context,
     format: str = "skp"
 ) -> str:
@@ -806,8 +1436,8 @@ def export_scene(
         On failure, includes an error 'message' and 'details'.
     """
     try:
-        sketchup = get_sketchup_connection()
-        result = sketchup.send_command(
+        sketchup = await get_sketchup_connection()
+        result = await sketchup.send_command(
             method="tools/call",
             params={
                 "name": "export",
@@ -822,26 +1452,27 @@ def export_scene(
             file_path = result.get("file_path", "An unspecified location by SketchUp")
             message = f"Scene successfully exported in {format.upper()} format. File saved to: {file_path}."
             logger.info(message)
-            return json.dumps({"message": message, "details": result})
+            return _dumps({"message": message, "details": result})
         elif result:
             error_reason = result.get("message", f"Export to {format.upper()} format failed.")
             message = f"Failed to export scene in {format.upper()} format. Reason: {error_reason}"
             logger.warning(message)
-            return json.dumps({"message": message, "details": result})
+            return _dumps({"message": message, "details": result})
         else:
             message = f"Received an unexpected or empty response when trying to export scene in {format.upper()} format."
             logger.error(message)
-            return json.dumps({"message": message, "error": True, "details": None})
+            return _dumps({"message": message, "error": True, "details": None})
 
     except Exception as e:
-        logger.error(f"Error in export_scene with format '{format}': {str(e)}")
-        return json.dumps({
+        logger.error("Error in export_scene with format '%s': %s", format, e)
+        return _dumps({
             "message": f"Error exporting scene in {format.upper()} format: {str(e)}",
             "error": True,
             "details": None
         })
 
 @mcp.tool()
+@rpc("create_mortise_tenon", "Error creating mortise and tenon joint")
 def create_mortise_tenon(
     ctx: Context,
     mortise_id: str,
@@ -852,38 +1483,23 @@ def create_mortise_tenon(
     offset_x: float = 0.0,
     offset_y: float = 0.0,
     offset_z: float = 0.0
-) -> str:
+) -> Dict[str, Any]:
     """Create a mortise and tenon joint between two components"""
-    try:
-        logger.info(f"create_mortise_tenon called with mortise_id={mortise_id}, tenon_id={tenon_id}, width={width}, height={height}, depth={depth}, offsets=({offset_x}, {offset_y}, {offset_z})")
-        
-        sketchup = get_sketchup_connection()
-        
-        result = sketchup.send_command(
-            method="tools/call",
-            params={
-                "name": "create_mortise_tenon",
-                "arguments": {
-                    "mortise_id": mortise_id,
-                    "tenon_id": tenon_id,
-                    "width": width,
-                    "height": height,
-                    "depth": depth,
-                    "offset_x": offset_x,
-                    "offset_y": offset_y,
-                    "offset_z": offset_z
-                }
-            },
-            request_id=ctx.request_id
-        )
-        
-        logger.info(f"create_mortise_tenon result: {result}")
-        return json.dumps(result)
-    except Exception as e:
-        logger.error(f"Error in create_mortise_tenon: {str(e)}")
-        return f"Error creating mortise and tenon joint: {str(e)}"
+    logger.info("create_mortise_tenon called with mortise_id=%s, tenon_id=%s, width=%s, height=%s, depth=%s, offsets=(%s, %s, %s)", mortise_id, tenon_id, width, height, depth, offset_x, offset_y, offset_z)
+    
+    return {
+        "mortise_id": mortise_id,
+        "tenon_id": tenon_id,
+        "width": width,
+        "height": height,
+        "depth": depth,
+        "offset_x": offset_x,
+        "offset_y": offset_y,
+        "offset_z": offset_z
+    }
 
 @mcp.tool()
+@rpc("create_dovetail", "Error creating dovetail joint")
 def create_dovetail(
     ctx: Context,
     tail_id: str,
@@ -896,40 +1512,25 @@ def create_dovetail(
     offset_x: float = 0.0,
     offset_y: float = 0.0,
     offset_z: float = 0.0
-) -> str:
+) -> Dict[str, Any]:
     """Create a dovetail joint between two components"""
-    try:
-        logger.info(f"create_dovetail called with tail_id={tail_id}, pin_id={pin_id}, width={width}, height={height}, depth={depth}, angle={angle}, num_tails={num_tails}")
-        
-        sketchup = get_sketchup_connection()
-        
-        result = sketchup.send_command(
-            method="tools/call",
-            params={
-                "name": "create_dovetail",
-                "arguments": {
-                    "tail_id": tail_id,
-                    "pin_id": pin_id,
-                    "width": width,
-                    "height": height,
-                    "depth": depth,
-                    "angle": angle,
-                    "num_tails": num_tails,
-                    "offset_x": offset_x,
-                    "offset_y": offset_y,
-                    "offset_z": offset_z
-                }
-            },
-            request_id=ctx.request_id
-        )
-        
-        logger.info(f"create_dovetail result: {result}")
-        return json.dumps(result)
-    except Exception as e:
-        logger.error(f"Error in create_dovetail: {str(e)}")
-        return f"Error creating dovetail joint: {str(e)}"
+    logger.info("create_dovetail called with tail_id=%s, pin_id=%s, width=%s, height=%s, depth=%s, angle=%s, num_tails=%s", tail_id, pin_id, width, height, depth, angle, num_tails)
+    
+    return {
+        "tail_id": tail_id,
+        "pin_id": pin_id,
+        "width": width,
+        "height": height,
+        "depth": depth,
+        "angle": angle,
+        "num_tails": num_tails,
+        "offset_x": offset_x,
+        "offset_y": offset_y,
+        "offset_z": offset_z
+    }
 
 @mcp.tool()
+@rpc("create_finger_joint", "Error creating finger joint")
 def create_finger_joint(
     ctx: Context,
     board1_id: str,
@@ -941,50 +1542,34 @@ def create_finger_joint(
     offset_x: float = 0.0,
     offset_y: float = 0.0,
     offset_z: float = 0.0
-) -> str:
+) -> Dict[str, Any]:
     """Create a finger joint (box joint) between two components"""
-    try:
-        logger.info(f"create_finger_joint called with board1_id={board1_id}, board2_id={board2_id}, width={width}, height={height}, depth={depth}, num_fingers={num_fingers}")
-        
-        sketchup = get_sketchup_connection()
-        
-        result = sketchup.send_command(
-            method="tools/call",
-            params={
-                "name": "create_finger_joint",
-                "arguments": {
-                    "board1_id": board1_id,
-                    "board2_id": board2_id,
-                    "width": width,
-                    "height": height,
-                    "depth": depth,
-                    "num_fingers": num_fingers,
-                    "offset_x": offset_x,
-                    "offset_y": offset_y,
-                    "offset_z": offset_z
-                }
-            },
-            request_id=ctx.request_id
-        )
-        
-        logger.info(f"create_finger_joint result: {result}")
-        return json.dumps(result)
-    except Exception as e:
-        logger.error(f"Error in create_finger_joint: {str(e)}")
-        return f"Error creating finger joint: {str(e)}"
+    logger.info("create_finger_joint called with board1_id=%s, board2_id=%s, width=%s, height=%s, depth=%s, num_fingers=%s", board1_id, board2_id, width, height, depth, num_fingers)
+    
+    return {
+        "board1_id": board1_id,
+        "board2_id": board2_id,
+        "width": width,
+        "height": height,
+        "depth": depth,
+        "num_fingers": num_fingers,
+        "offset_x": offset_x,
+        "offset_y": offset_y,
+        "offset_z": offset_z
+    }
 
 @mcp.tool()
-def eval_ruby(
+async def eval_ruby(
     ctx: Context,
     code: str
 ) -> str:
     """Evaluate arbitrary Ruby code in Sketchup"""
     try:
-        logger.info(f"eval_ruby called with code length: {len(code)}")
+        logger.info("eval_ruby called with code length: %d", len(code))
         
-        sketchup = get_sketchup_connection()
+        sketchup = await get_sketchup_connection()
         
-        result = sketchup.send_command(
+        result = await sketchup.send_command(
             method="tools/call",
             params={
                 "name": "eval_ruby",
@@ -995,7 +1580,7 @@ def eval_ruby(
             request_id=ctx.request_id
         )
         
-        logger.info(f"eval_ruby result: {result}")
+        logger.info("eval_ruby result: %s", result)
         
         # Format the response to include the result
         response = {
@@ -1003,163 +1588,109 @@ def eval_ruby(
             "result": result.get("content", [{"text": "Success"}])[0].get("text", "Success") if isinstance(result.get("content"), list) and len(result.get("content", [])) > 0 else "Success"
         }
         
-        return json.dumps(response)
+        return _dumps(response)
     except Exception as e:
-        logger.error(f"Error in eval_ruby: {str(e)}")
-        return json.dumps({
+        logger.error("Error in eval_ruby: %s", e)
+        return _dumps({
             "success": False,
             "error": str(e)
         })
 
 @mcp.tool()
-def calculate_distance(
+async def calculate_distance(
     ctx: Context,
     point1: List[float],
     point2: List[float]
 ) -> str:
     """Calculate distance between two 3D points"""
     try:
-        sketchup = get_sketchup_connection()
-        result = sketchup.send_command(
-            method="tools/call",
-            params={
-                "name": "calculate_distance",
-                "arguments": {
-                    "point1": point1,
-                    "point2": point2
-                }
-            },
-            request_id=ctx.request_id
-        )
-        return json.dumps(result)
+        # Plain arithmetic, so it is done here rather than in Sketchup
+        for label, point in (("point1", point1), ("point2", point2)):
+            if not isinstance(point, (list, tuple)) or len(point) != 3:
+                raise ValueError(f"Invalid {label}: {point!r}. Must be an array of 3 numbers [x, y, z]")
+        point1 = [float(coord) for coord in point1]
+        point2 = [float(coord) for coord in point2]
+        return _dumps({
+            "distance": math.dist(point1, point2),
+            "point1": point1,
+            "point2": point2,
+            "delta": [b - a for a, b in zip(point1, point2)],
+            "success": True
+        })
     except Exception as e:
         return f"Error calculating distance: {str(e)}"
 
 @mcp.tool()
+@rpc("measure_components", "Error measuring components")
 def measure_components(
     ctx: Context,
     component_ids: List[str],
     type: str = "center_to_center"
-) -> str:
+) -> Dict[str, Any]:
     """Measure distances between components"""
-    try:
-        sketchup = get_sketchup_connection()
-        result = sketchup.send_command(
-            method="tools/call",
-            params={
-                "name": "measure_components",
-                "arguments": {
-                    "component_ids": component_ids,
-                    "type": type
-                }
-            },
-            request_id=ctx.request_id
-        )
-        return json.dumps(result)
-    except Exception as e:
-        return f"Error measuring components: {str(e)}"
+    return {
+        "component_ids": component_ids,
+        "type": type
+    }
 
 @mcp.tool()
+@rpc("inspect_component", "Error inspecting component")
 def inspect_component(
     ctx: Context,
     component_id: str
-) -> str:
+) -> Dict[str, Any]:
     """Get detailed information about a component"""
-    try:
-        sketchup = get_sketchup_connection()
-        result = sketchup.send_command(
-            method="tools/call",
-            params={
-                "name": "inspect_component",
-                "arguments": {
-                    "component_id": component_id
-                }
-            },
-            request_id=ctx.request_id
-        )
-        return json.dumps(result)
-    except Exception as e:
-        return f"Error inspecting component: {str(e)}"
+    return {
+        "component_id": component_id
+    }
 
 @mcp.tool()
+@rpc("create_reference_markers", "Error creating reference markers", queueable=True)
 def create_reference_markers(
     ctx: Context,
     points: List[List[float]],
     size: float = 1.0,
     color: str = "red",
     label_prefix: str = "REF"
-) -> str:
+) -> Dict[str, Any]:
     """Create visual reference markers at specified points"""
-    try:
-        sketchup = get_sketchup_connection()
-        result = sketchup.send_command(
-            method="tools/call",
-            params={
-                "name": "create_reference_markers",
-                "arguments": {
-                    "points": points,
-                    "size": size,
-                    "color": color,
-                    "label_prefix": label_prefix
-                }
-            },
-            request_id=ctx.request_id
-        )
-        return json.dumps(result)
-    except Exception as e:
-        return f"Error creating reference markers: {str(e)}"
+    return {
+        "points": points,
+        "size": size,
+        "color": color,
+        "label_prefix": label_prefix
+    }
 
 @mcp.tool()
+@rpc("clear_reference_markers", "Error clearing reference markers", queueable=True)
 def clear_reference_markers(
     ctx: Context,
     label_prefix: str = "REF"
-) -> str:
+) -> Dict[str, Any]:
     """Clear reference markers with specified label prefix"""
-    try:
-        sketchup = get_sketchup_connection()
-        result = sketchup.send_command(
-            method="tools/call",
-            params={
-                "name": "clear_reference_markers",
-                "arguments": {
-                    "label_prefix": label_prefix
-                }
-            },
-            request_id=ctx.request_id
-        )
-        return json.dumps(result)
-    except Exception as e:
-        return f"Error clearing reference markers: {str(e)}"
+    return {
+        "label_prefix": label_prefix
+    }
 
 @mcp.tool()
+@rpc("snap_align_component", "Error snapping/aligning component")
 def snap_align_component(
     ctx: Context,
     source_component_id: str,
     target_component_id: str,
     alignment_type: str = "center_to_center",
     offset: List[float] = None
-) -> str:
+) -> Dict[str, Any]:
     """Snap/align one component to another"""
-    try:
-        sketchup = get_sketchup_connection()
-        result = sketchup.send_command(
-            method="tools/call",
-            params={
-                "name": "snap_align_component",
-                "arguments": {
-                    "source_component_id": source_component_id,
-                    "target_component_id": target_component_id,
-                    "alignment_type": alignment_type,
-                    "offset": offset or [0, 0, 0]
-                }
-            },
-            request_id=ctx.request_id
-        )
-        return json.dumps(result)
-    except Exception as e:
-        return f"Error snapping/aligning component: {str(e)}"
+    return {
+        "source_component_id": source_component_id,
+        "target_component_id": target_component_id,
+        "alignment_type": alignment_type,
+        "offset": offset or [0, 0, 0]
+    }
 
 @mcp.tool()
+@rpc("create_grid_system", "Error creating grid system", queueable=True)
 def create_grid_system(
     ctx: Context,
     origin: List[float] = None,
@@ -1171,88 +1702,54 @@ def create_grid_system(
     show_labels: bool = True,
     color: str = "gray",
     label_prefix: str = "GRID"
-) -> str:
+) -> Dict[str, Any]:
     """Create a visual grid reference system"""
-    try:
-        sketchup = get_sketchup_connection()
-        result = sketchup.send_command(
-            method="tools/call",
-            params={
-                "name": "create_grid_system",
-                "arguments": {
-                    "origin": origin or [0, 0, 0],
-                    "x_spacing": x_spacing,
-                    "y_spacing": y_spacing,
-                    "x_count": x_count,
-                    "y_count": y_count,
-                    "marker_size": marker_size,
-                    "show_labels": show_labels,
-                    "color": color,
-                    "label_prefix": label_prefix
-                }
-            },
-            request_id=ctx.request_id
-        )
-        return json.dumps(result)
-    except Exception as e:
-        return f"Error creating grid system: {str(e)}"
+    return {
+        "origin": origin or [0, 0, 0],
+        "x_spacing": x_spacing,
+        "y_spacing": y_spacing,
+        "x_count": x_count,
+        "y_count": y_count,
+        "marker_size": marker_size,
+        "show_labels": show_labels,
+        "color": color,
+        "label_prefix": label_prefix
+    }
 
 @mcp.tool()
+@rpc("query_all_components", "Error querying components")
 def query_all_components(
     ctx: Context,
     include_details: bool = True,
     type_filter: str = None
-) -> str:
+) -> Dict[str, Any]:
     """Query all components in the model"""
-    try:
-        sketchup = get_sketchup_connection()
-        arguments = {
-            "include_details": include_details
-        }
-        if type_filter:
-            arguments["type_filter"] = type_filter
-            
-        result = sketchup.send_command(
-            method="tools/call",
-            params={
-                "name": "query_all_components",
-                "arguments": arguments
-            },
-            request_id=ctx.request_id
-        )
-        return json.dumps(result)
-    except Exception as e:
-        return f"Error querying components: {str(e)}"
+    arguments = {
+        "include_details": include_details
+    }
+    if type_filter:
+        arguments["type_filter"] = type_filter
+    return arguments
 
 @mcp.tool()
+@rpc("position_relative_to_component", "Error positioning component relatively")
 def position_relative_to_component(
     ctx: Context,
     source_component_id: str,
     reference_component_id: str,
     relative_position: str,
     offset: List[float] = None
-) -> str:
+) -> Dict[str, Any]:
     """Position a component relative to another component"""
-    try:
-        sketchup = get_sketchup_connection()
-        result = sketchup.send_command(
-            method="tools/call",
-            params={
-                "name": "position_relative_to_component",
-                "arguments": {
-                    "source_component_id": source_component_id,
-                    "reference_component_id": reference_component_id,
-                    "relative_position": relative_position,
-                    "offset": offset or [0, 0, 0]
-                }
-            },
-            request_id=ctx.request_id
-        )
-        return json.dumps(result)
-    except Exception as e:
-        return f"Error positioning component relatively: {str(e)}"
+    return {
+        "source_component_id": source_component_id,
+        "reference_component_id": reference_component_id,
+        "relative_position": relative_position,
+        "offset": offset or [0, 0, 0]
+    }
 
 @mcp.tool()
+@rpc("position_between_components", "Error positioning component between others")
 def position_between_components(
     ctx: Context,
     source_component_id: str,
@@ -1260,58 +1757,35 @@ def position_between_components(
     component2_id: str,
     ratio: float = 0.5,
     offset: List[float] = None
-) -> str:
+) -> Dict[str, Any]:
     """Position a component between two other components"""
-    try:
-        sketchup = get_sketchup_connection()
-        result = sketchup.send_command(
-            method="tools/call",
-            params={
-                "name": "position_between_components",
-                "arguments": {
-                    "source_component_id": source_component_id,
-                    "component1_id": component1_id,
-                    "component2_id": component2_id,
-                    "ratio": ratio,
-                    "offset": offset or [0, 0, 0]
-                }
-            },
-            request_id=ctx.request_id
-        )
-        return json.dumps(result)
-    except Exception as e:
-        return f"Error positioning component between others: {str(e)}"
+    return {
+        "source_component_id": source_component_id,
+        "component1_id": component1_id,
+        "component2_id": component2_id,
+        "ratio": ratio,
+        "offset": offset or [0, 0, 0]
+    }
 
 @mcp.tool()
+@rpc("show_component_bounds", "Error showing component bounds", queueable=True)
 def show_component_bounds(
     ctx: Context,
     component_ids: List[str],
     show_wireframe: bool = True,
     color: str = "yellow",
     label_prefix: str = "BOUNDS"
-) -> str:
+) -> Dict[str, Any]:
     """Show bounding boxes for components"""
-    try:
-        sketchup = get_sketchup_connection()
-        result = sketchup.send_command(
-            method="tools/call",
-            params={
-                "name": "show_component_bounds",
-                "arguments": {
-                    "component_ids": component_ids,
-                    "show_wireframe": show_wireframe,
-                    "color": color,
-                    "label_prefix": label_prefix
-                }
-            },
-            request_id=ctx.request_id
-        )
-        return json.dumps(result)
-    except Exception as e:
-        return f"Error showing component bounds: {str(e)}"
+    return {
+        "component_ids": component_ids,
+        "show_wireframe": show_wireframe,
+        "color": color,
+        "label_prefix": label_prefix
+    }
 
 @mcp.tool()
-def preview_position(
+async def preview_position(
     ctx: Context,
     type: str = "cube",
     position: List[float] = None,
@@ -1339,20 +1813,60 @@ def preview_position(
         Detailed positioning preview including bounds, center, corners, and explanation
     """
     try:
-        sketchup = get_sketchup_connection()
-        result = sketchup.send_command(
-            method="tools/call",
-            params={
-                "name": "preview_position",
-                "arguments": {
-                    "type": type,
-                    "position": position or [0, 0, 0],
-                    "dimensions": dimensions or [1, 1, 1]
-                }
+        # Positions are centers and nothing is created, so the preview is
+        # computed here with the same rules as the Sketchup extension
+        position = position or [0, 0, 0]
+        dimensions = dimensions or [1, 1, 1]
+        if not isinstance(position, (list, tuple)) or len(position) != 3:
+            raise ValueError(f"Invalid position: {position!r}. Must be an array of 3 numbers [x, y, z]")
+        if not isinstance(dimensions, (list, tuple)) or len(dimensions) != 3:
+            raise ValueError(f"Invalid dimensions: {dimensions!r}. Must be an array of 3 numbers [width, height, depth]")
+        
+        center = [float(coord) for coord in position]
+        width, height, depth = (float(d) for d in dimensions)
+        half = (width / 2.0, height / 2.0, depth / 2.0)
+        min_point = [c - h for c, h in zip(center, half)]
+        max_point = [c + h for c, h in zip(center, half)]
+        
+        # All 8 corners, from the min corner through +X, +Y and +Z to the max corner
+        corners = [
+            [x, y, z]
+            for z in (min_point[2], max_point[2])
+            for y in (min_point[1], max_point[1])
+            for x in (min_point[0], max_point[0])
+        ]
+        
+        origin_explanation = "CENTER POINT"
+        direction_explanation = "Component will be created by extruding upward in +Z direction."
+        return _dumps({
+            "type": type,
+            "requested_position": position,
+            "requested_dimensions": dimensions,
+            "direction": "up",
+            "origin_mode": "center",
+            "positioning_method": "center_point",
+            "center_point": center,
+            "bounds": {
+                "min": min_point,
+                "max": max_point,
+                "width": width,
+                "height": height,
+                "depth": depth,
+                "corners": corners
             },
-            request_id=ctx.request_id
-        )
-        return json.dumps(result)
+            "positioning_explanation": (f"Position {center} interpreted as {origin_explanation}. {direction_explanation} "
+                                        f"Component center will be at {center}, resulting in bounds from {min_point} to {max_point}."),
+            "coordinate_system": {
+                "description": "X+ = Right, Y+ = Forward/Depth, Z+ = Up",
+                "growth_pattern": "Component grows equally in all directions from calculated center position"
+            },
+            "directional_info": {
+                "origin_explanation": origin_explanation,
+                "direction_explanation": direction_explanation,
+                "center_offset": [0.0, 0.0, 0.0]
+            },
+            "success": True
+        })
     except Exception as e:
         return f"Error previewing position: {str(e)}"
 
@@ -29,10 +29,12 @@ module SketchupMCP
         type: operation[:type],
         request: operation[:request],
         client_id: operation[:client_id],
+        codec: operation[:codec] || :json,
         created_at: Time.now,
         status: :pending,
         attempts: 0,
         last_attempt_at: nil,
+        request_id: nil,
         error_message: nil,
         result: nil
       }
@@ -51,15 +53,23 @@ module SketchupMCP
       
       Logging.log "Starting execution of operation #{operation_id} (attempt #{operation_info[:attempts]})"
       
-      # Send immediate acknowledgment to client that operation is running
-      send_operation_status_update(operation_info, "Operation started, processing...", active_clients)
-      
       # Parse the request
       begin
-        parsed_request = JSON.parse(operation_info[:request])
+        parsed_request = parse_request(operation_info)
+        
+        # A JSON-RPC batch runs every call and answers with a single array
+        if parsed_request.is_a?(Array)
+          execute_batch_operation(parsed_request, operation_info, active_clients)
+          return
+        end
         
         # Extract request ID
         original_id = Validation.extract_request_id(operation_info[:request], parsed_request)
+        operation_info[:request_id] = original_id
+        
+        # Send immediate acknowledgment to client that operation is running,
+        # tagged with the request id so pipelined clients can route it
+        send_operation_status_update(operation_info, "Operation started, processing...", active_clients)
         
         # Determine timeout based on operation complexity
         timeout_duration = Validation.determine_operation_timeout(parsed_request)
@@ -112,6 +122,67 @@ module SketchupMCP
       end
     end
     
+    def self.execute_batch_operation(requests, operation_info, active_clients)
+      Logging.log "Executing batch of #{requests.length} requests for operation #{operation_info[:id]}"
+      
+      responses = requests.map do |request|
+        request_id = request.is_a?(Hash) ? request["id"] : nil
+        begin
+          raise "Invalid request in batch" unless request.is_a?(Hash)
+          
+          result = nil
+          Timeout::timeout(Validation.determine_operation_timeout(request)) do
+            result = handle_tool_request(request)
+          end
+          { jsonrpc: "2.0", result: result, id: request_id }
+        rescue Timeout::Error
+          { jsonrpc: "2.0", error: { code: -32603, message: "Operation failed: Operation timeout" }, id: request_id }
+        rescue StandardError => e
+          Logging.log "Batch request #{request_id} failed: #{e.message}"
+          { jsonrpc: "2.0", error: { code: -32603, message: "Operation failed: #{e.message}" }, id: request_id }
+        end
+      end
+      
+      operation_info[:status] = :completed
+      operation_info[:result] = responses
+      
+      client_info = active_clients[operation_info[:client_id]]
+      return unless client_info
+      
+      if send_response(client_info, responses)
+        Logging.log "Sent batch result for operation #{operation_info[:id]} to client #{operation_info[:client_id]}"
+      else
+        Logging.log "Failed to send batch result for operation #{operation_info[:id]} - client may have disconnected"
+        # Remove client from active clients if send failed
+        active_clients.delete(operation_info[:client_id])
+      end
+    end
+    
+    def self.parse_request(operation_info)
+      # Requests are JSON lines unless the client negotiated msgpack
+      if operation_info[:codec] == :msgpack
+        MessagePack.unpack(operation_info[:request])
+      else
+        JSON.parse(operation_info[:request])
+      end
+    end
+    
+    def self.negotiate_framing(line, client_info)
+      # Answers a "hello" request and switches the client's framing when
+      # both sides support msgpack. Returns false for any other line.
+      request = JSON.parse(line) rescue nil
+      return false unless request.is_a?(Hash) && request["method"] == "hello"
+      
+      offered = (request["params"] || {})["content_types"] || []
+      content_type = defined?(MessagePack) && offered.include?("application/msgpack") ? "application/msgpack" : "application/json"
+      Logging.log "Client negotiated #{content_type} framing"
+      
+      # The reply still goes out as JSON; the client switches once it reads it
+      send_response(client_info, { jsonrpc: "2.0", result: { content_type: content_type }, id: request["id"] })
+      client_info[:codec] = :msgpack if content_type == "application/msgpack"
+      true
+    end
+    
     def self.retry_failed_operation_by_id(operation_id, pending_operations)
       operation_info = pending_operations[operation_id]
       return unless operation_info && operation_info[:status] == :failed
@@ -170,13 +241,14 @@ module SketchupMCP
         method: "operation/status",
         params: {
           operation_id: operation_info[:id],
+          request_id: operation_info[:request_id],
           status: operation_info[:status].to_s,
           message: message,
           timestamp: Time.now.to_f
         }
       }
       
-      success = send_response(client_info[:socket], status_response)
+      success = send_response(client_info, status_response)
       if !success
         Logging.log "Failed to send status update for operation #{operation_info[:id]} - client may have disconnected"
         # Remove client from active clients if send failed
@@ -192,7 +264,7 @@ module SketchupMCP
       original_id = nil
       begin
         if operation_info[:request]
-          parsed_request = JSON.parse(operation_info[:request])
+          parsed_request = parse_request(operation_info)
           original_id = parsed_request["id"]
         end
       rescue
@@ -205,7 +277,7 @@ module SketchupMCP
         id: original_id
       }
       
-      success = send_response(client_info[:socket], result_response)
+      success = send_response(client_info, result_response)
       if success
         Logging.log "Sent result for operation #{operation_info[:id]} to client #{operation_info[:client_id]}"
       else
@@ -223,7 +295,7 @@ module SketchupMCP
       original_id = nil
       begin
         if operation_info[:request]
-          parsed_request = JSON.parse(operation_info[:request])
+          parsed_request = parse_request(operation_info)
           original_id = parsed_request["id"]
         end
       rescue
@@ -243,7 +315,7 @@ module SketchupMCP
         id: original_id
       }
       
-      success = send_response(client_info[:socket], error_response)
+      success = send_response(client_info, error_response)
       if success
         Logging.log "Sent error for operation #{operation_info[:id]} to client #{operation_info[:client_id]}"
       else
@@ -332,10 +404,26 @@ module SketchupMCP
     
     private
     
-    def self.send_response(client, response)
+    def self.send_response(client_info, response)
+      client = client_info[:socket]
       begin
-        response_json = response.to_json + "\n"
-        Logging.log "Sending response: #{response_json.strip}"
+        if client_info[:codec] == :msgpack
+          # Length-prefixed, as negotiated with the client
+          payload = begin
+            response.to_msgpack
+          rescue NoMethodError
+            # Values msgpack can't pack go through their JSON form
+            JSON.parse(response.to_json).to_msgpack
+          end
+          frame = [payload.bytesize].pack('N') + payload
+          Logging.log "Sending #{payload.bytesize} byte msgpack response"
+        else
+          # Responses are newline-delimited: to_json escapes any newline inside
+          # strings, so the trailing "\n" is the only one in the frame and the
+          # client can split responses on it without parsing.
+          frame = response.to_json + "\n"
+          Logging.log "Sending response: #{frame.strip}"
+        end
         
         # Check if client socket is valid before writing
         if client.nil?
@@ -354,13 +442,16 @@ module SketchupMCP
         
         # Test if socket is still open
         begin
-          bytes_written = client.write(response_json)
+          bytes_written = client.write(frame)
           Logging.log "Wrote #{bytes_written} bytes to client"
           client.flush
           
           # Small delay to prevent race conditions
           sleep(0.01)
           
+          # A client waiting on a long operation is still active
+          client_info[:last_activity] = Time.now
+          
           Logging.log "Response sent successfully"
           return true
         rescue Errno::EPIPE, Errno::ECONNRESET, IOError => e
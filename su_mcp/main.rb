@@ -4,6 +4,12 @@ require 'socket'
 require 'fileutils'
 require 'timeout'
 
+begin
+  require 'msgpack'
+rescue LoadError
+  # Optional: without the gem every client stays on JSON framing
+end
+
 # Create a more robust initialization lock using multiple mechanisms
 INIT_LOCK_FILE = File.join(File.dirname(__FILE__), '.mcp_init_lock')
 INIT_TIMESTAMP = Time.now.to_f
@@ -28,6 +28,7 @@ module SketchupMCP
       @pending_operations = {}  # operation_id => operation_info
       @operation_counter = 0
       @max_operation_time = 300.0  # 5 minutes max for any operation
+      @client_idle_timeout = 60.0  # Close clients that send nothing for a minute
       @operation_check_interval = 5.0  # Check operation status every 5 seconds
       @retry_failed_operations = true
       @max_operation_retries = 3
@@ -229,8 +230,8 @@ module SketchupMCP
       dead_clients = []
       
       @active_clients.each do |client_id, client_info|
-        # Remove clients that haven't been active for 60 seconds
-        if now - client_info[:last_activity] > 60
+        # Remove clients that haven't been active for @client_idle_timeout seconds
+        if now - client_info[:last_activity] > @client_idle_timeout
           dead_clients << client_id
         end
       end
@@ -305,18 +306,22 @@ module SketchupMCP
       client_socket = client_info[:socket]
       
       begin
-        # Try to read data with timeout
-        data = nil
+        # Read whatever is available without blocking. Asking for a status
+        # instead of rescuing IO::WaitReadable keeps the common "no data yet"
+        # case from raising an exception on every poll.
         begin
-          # Use a timeout to prevent hanging
-          Timeout::timeout(1.0) do
-            chunk = client_socket.read_nonblock(8192)
-            client_info[:buffer] += chunk if chunk
-            client_info[:last_activity] = Time.now
-          end
-        rescue IO::WaitReadable
-          # No data available - schedule retry if client is still young
-          if Time.now - client_info[:connected_at] < 5.0
+          chunk = client_socket.read_nonblock(8192, exception: false)
+        rescue StandardError => e
+          log "Error reading from client #{client_id}: #{e.message}"
+          @active_clients.delete(client_id)
+          client_socket.close rescue nil
+          return
+        end
+        
+        if chunk == :wait_readable
+          # No data available - keep polling while the client has been
+          # active recently; a persistent connection idles between calls
+          if Time.now - client_info[:last_activity] < @client_idle_timeout
             @operation_queue << {
               type: :read_from_client,
               client_id: client_id,
@@ -329,40 +334,58 @@ module SketchupMCP
             client_socket.close rescue nil
           end
           return
-        rescue Timeout::Error
-          log "Client #{client_id} read timeout"
-          @active_clients.delete(client_id)
-          client_socket.close rescue nil
-          return
-        rescue EOFError
+        elsif chunk.nil?
           log "Client #{client_id} closed connection"
           @active_clients.delete(client_id)
           client_socket.close rescue nil
           return
-        rescue StandardError => e
-          log "Error reading from client #{client_id}: #{e.message}"
-          @active_clients.delete(client_id)
-          client_socket.close rescue nil
-          return
         end
         
-        # Check if we have complete JSON messages in the buffer
+        # Append in place rather than building a new buffer for every chunk
         buffer = client_info[:buffer]
-        while buffer.include?("\n")
-          line, buffer = buffer.split("\n", 2)
-          next if line.strip.empty?
+        buffer << chunk
+        client_info[:last_activity] = Time.now
+        
+        # Queue each complete line, scanning forward from the last newline
+        # and trimming the consumed prefix once at the end
+        start = 0
+        while client_info[:codec] != :msgpack && (newline = buffer.index("\n", start))
+          line = buffer[start...newline].strip
+          start = newline + 1
+          next if line.empty?
+          
+          # A framing negotiation is answered right away; anything after it
+          # is framed the way it settled on
+          next if line.include?('"hello"') && SketchupMCP::Operations.negotiate_framing(line, client_info)
           
           # Queue the request processing
           @operation_queue << {
             type: :execute_request,
-            request: line.strip,
+            request: line,
             client_id: client_id,
             created_at: Time.now
           }
         end
         
-        # Update the buffer
-        client_info[:buffer] = buffer
+        # msgpack frames are a 4-byte big-endian length and the payload
+        if client_info[:codec] == :msgpack
+          while buffer.bytesize - start >= 4
+            length = buffer.byteslice(start, 4).unpack1('N')
+            break if buffer.bytesize - start - 4 < length
+            
+            @operation_queue << {
+              type: :execute_request,
+              request: buffer.byteslice(start + 4, length),
+              codec: :msgpack,
+              client_id: client_id,
+              created_at: Time.now
+            }
+            start += 4 + length
+          end
+        end
+        
+        # Keep only the incomplete tail in the buffer
+        client_info[:buffer] = buffer.byteslice(start..-1) if start > 0
         
         # Continue reading if client is still connected
         if @active_clients[client_id]
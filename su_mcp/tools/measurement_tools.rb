@@ -463,54 +463,65 @@ module SketchupMCP
       grid_points = []
       created_markers = []
       entities = model.active_entities
-      
-      # Create grid points
-      for x in 0..x_count
-        for y in 0..y_count
-          point = [
-            origin[0] + (x * x_spacing),
-            origin[1] + (y * y_spacing),
-            origin[2]
-          ]
-          grid_points << point
-          
-          # Create marker
-          group = entities.add_group
-          
-          # Create small cube marker
-          half_size = marker_size / 2.0
-          face = group.entities.add_face(
-            [point[0] - half_size, point[1] - half_size, point[2] - half_size],
-            [point[0] + half_size, point[1] - half_size, point[2] - half_size],
-            [point[0] + half_size, point[1] + half_size, point[2] - half_size],
-            [point[0] - half_size, point[1] + half_size, point[2] - half_size]
-          )
-          
-          face.pushpull(marker_size)
-          
-          # Set color
-          if color && color != "default"
-            set_marker_material(group, color)
-          end
-          
-          marker_info = {
-            id: group.entityID,
-            position: point,
-            grid_x: x,
-            grid_y: y
-          }
-          
-          # Add label if requested
-          if show_labels
-            label = "#{label_prefix}_#{x}_#{y}"
-            text_point = [point[0], point[1], point[2] + marker_size]
-            text = entities.add_text(label, text_point)
-            marker_info[:label] = label
-            marker_info[:text_id] = text.entityID
+      half_size = marker_size / 2.0
+      material = nil
+      
+      # Build the whole grid as one operation: a single undo step, and
+      # SketchUp skips UI updates until it is committed
+      model.start_operation("Create Grid System", true)
+      begin
+        # Create grid points
+        (0..x_count).each do |x|
+          px = origin[0] + (x * x_spacing)
+          (0..y_count).each do |y|
+            point = [px, origin[1] + (y * y_spacing), origin[2]]
+            grid_points << point
+            
+            # Create marker
+            group = entities.add_group
+            
+            # Create small cube marker
+            face = group.entities.add_face(
+              [point[0] - half_size, point[1] - half_size, point[2] - half_size],
+              [point[0] + half_size, point[1] - half_size, point[2] - half_size],
+              [point[0] + half_size, point[1] + half_size, point[2] - half_size],
+              [point[0] - half_size, point[1] + half_size, point[2] - half_size]
+            )
+            
+            face.pushpull(marker_size)
+            
+            # Set color, looking the material up only for the first marker
+            if color && color != "default"
+              if material
+                group.entities.grep(Sketchup::Face) { |marker_face| marker_face.material = material }
+              else
+                material = set_marker_material(group, color)
+              end
+            end
+            
+            marker_info = {
+              id: group.entityID,
+              position: point,
+              grid_x: x,
+              grid_y: y
+            }
+            
+            # Add label if requested
+            if show_labels
+              label = "#{label_prefix}_#{x}_#{y}"
+              text_point = [point[0], point[1], point[2] + marker_size]
+              text = entities.add_text(label, text_point)
+              marker_info[:label] = label
+              marker_info[:text_id] = text.entityID
+            end
+            
+            created_markers << marker_info
           end
-          
-          created_markers << marker_info
         end
+        model.commit_operation
+      rescue StandardError => e
+        model.abort_operation
+        raise e
       end
       
       result = {